@@ -1,17 +1,33 @@
 from algrotihms.dp_mdim import DP_MDIM
 from algrotihms.dp_dict import DP_DICT
+from algrotihms.dp_numpy import DP_NUMPY
+from algrotihms.dp_partition import DP_PARTITION
+from algrotihms.dp_parallel import DP_PARALLEL
 from algrotihms.leastloaded import LeastLoaded
 from algrotihms.lookahead import Lookahead
 from algrotihms.heavy_first import HeavyFirst
 from algrotihms.sort_and_split import SimpleSortAndSplit
 from algrotihms.balanced_sequential_insert import BalancedSequentialInsert
+from algrotihms.astar import AStar
+from algrotihms.beam import BeamDP
+from algrotihms.tabu import TabuSearch
+from algrotihms.genetic import GeneticAlgorithm
+from algrotihms.lns import LNS
 
 __all__ = [
     'DP_MDIM',
     'DP_DICT',
+    'DP_NUMPY',
+    'DP_PARTITION',
+    'DP_PARALLEL',
     'LeastLoaded',
     'Lookahead',
     'HeavyFirst',
     'SimpleSortAndSplit',
-    'BalancedSequentialInsert'
+    'BalancedSequentialInsert',
+    'AStar',
+    'BeamDP',
+    'TabuSearch',
+    'GeneticAlgorithm',
+    'LNS'
 ]
@@ -0,0 +1,57 @@
+import heapq
+
+from algrotihms.base import Solver, dtype
+from algrotihms.bounds import SlotBound
+
+
+class AStar(Solver):
+    """
+    Best-first (A*) search over the DP states (sorted machine counts), guided by the admissible
+    SlotBound on the remaining jobs. States are packed into single integers for the priority queue
+    and the table of best known values. Stops as soon as a state with all jobs assigned is popped.
+    The number of expanded states is kept in expanded.
+    """
+
+    name = "A*"
+
+    def __init__(self):
+        super().__init__()
+        self.expanded = None
+
+    def fit(self, n, m):
+        self.n, self.m = n, m
+
+    def transform(self, a):
+        n, m, base = self.n, self.m, self.n + 1
+        radix = [base ** (m - 1 - k) for k in range(m)]
+        bound = SlotBound(a, m)
+
+        def unpack(key): return [key // r % base for r in radix]
+
+        bound.layer(0)
+        best = {0: 0}
+        queue = [(bound([0] * m), 0, 0, 0)]
+        self.expanded = 0
+
+        while queue:
+            _, depth, g, key = heapq.heappop(queue)
+            if g > best[key]: continue
+
+            j = -depth
+            if j == n: return dtype(g)
+
+            self.expanded += 1
+            p = unpack(key)
+            ai = int(a[j])
+            bound.layer(j + 1)
+
+            for k in range(m):
+                if k > 0 and p[k] == p[k - 1]: continue
+
+                next_key, next_g = key + radix[k], g + (p[k] + 1) * ai
+                if next_g >= best.get(next_key, next_g + 1): continue
+
+                best[next_key] = next_g
+                p[k] += 1
+                heapq.heappush(queue, (next_g + bound(p), -(j + 1), next_g, next_key))
+                p[k] -= 1
@@ -1,6 +1,45 @@
 from algrotihms.base import Solver, decorate_sort
 
-from sortedcontainers import SortedList
+import numpy as np
+
+
+def t(index, weight):
+    """
+    Target function of a machine holding the given jobs, ordered by their index.
+    """
+    return int(weight[np.argsort(index, kind='stable')] @ np.arange(1, len(index) + 1))
+
+
+class _Machine:
+    """
+    Jobs of a machine being filled, in index order, with the running suffix sums of their weights
+    and its cost. Adding jobs shifts every job after each insertion point back by one, so the cost
+    with a batch of jobs added only takes the batch and where it inserts.
+    """
+
+    def __init__(self):
+        self.index = np.empty(0, dtype=np.int64)
+        self.weight = np.empty(0, dtype=np.int64)
+        self.suffix = np.zeros(1, dtype=np.int64)
+        self.cost = 0
+
+    def probe(self, index, weight):
+        """
+        :return: Cost with the jobs added, and the batch to pass to add to keep them
+        """
+        order = np.argsort(index, kind='stable')
+        index, weight = index[order], weight[order]
+        at = np.searchsorted(self.index, index)
+
+        cost = self.cost + int(self.suffix[at].sum()) + int(weight @ (at + np.arange(1, len(index) + 1)))
+        return cost, (at, index, weight)
+
+    def add(self, cost, batch):
+        at, index, weight = batch
+        self.index = np.insert(self.index, at, index)
+        self.weight = np.insert(self.weight, at, weight)
+        self.suffix = np.r_[np.cumsum(self.weight[::-1])[::-1], 0]
+        self.cost = cost
 
 
 class BalancedSequentialInsert(Solver):
@@ -22,6 +61,12 @@ class BalancedSequentialInsert(Solver):
     times across machines, making it particularly useful when the goal is to achieve an evenly
     distributed workload.
 
+    As the cost of a machine only grows with every added job, the number of jobs a machine takes
+    is found by an exponential and binary search over the cost of the next c jobs, where each probe
+    adds jobs to those already taken (see _Machine). Whether all jobs
+    fit is monotone in the number of jobs on the first machine, which is therefore binary searched
+    instead of increased one by one.
+
     Returns:
     - The target function across all machines once the jobs are distributed.
     """
@@ -30,32 +75,81 @@ class BalancedSequentialInsert(Solver):
 
     def __init__(self):
         super().__init__()
-        self.ms = None
-        self.t = lambda vs: Solver.t(vs, lambda v: v[1])
+        self.index = None
+        self.weight = None
+        self.ends = None
 
     def fit(self, n, m):
         self.n, self.m = n, m
-        self.ms = [SortedList() for _ in range(m)]
 
     def transform(self, a) -> int:
         a = decorate_sort(a)
-
-        i = 1
-        while not self.iterate(a, i): i += 1
-
-        return sum(self.t(m) for m in self.ms)
-
-    def iterate(self, a, i):
-        self._reset()
-        self.ms[0].update(a[:i])
-        t_m0 = self.t(self.ms[0])
-
-        for m in self.ms[1:]:
-            while self.t(m) < t_m0 and i < self.n:
-                m.add(a[i])
-                i += 1
-
-        return i == self.n
-
-    def _reset(self):
-        for m in self.ms: m.clear()
+        self.index = np.array([i for i, _ in a], dtype=np.int64)
+        self.weight = np.array([w for _, w in a], dtype=np.int64)
+
+        lo, hi = 1, self.n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.iterate(mid)[0]: hi = mid
+            else: lo = mid + 1
+
+        _, total = self.iterate(lo)
+
+        assignment = np.empty(self.n, dtype=np.int64)
+        for j, (start, end) in enumerate(zip([0] + self.ends[:-1], self.ends)): assignment[self.index[start:end]] = j
+        self.assignment = assignment.tolist()
+
+        return total
+
+    def iterate(self, i):
+        """
+        Put the i heaviest jobs on the first machine, then fill up the others one after another.
+        The end of each machine's jobs (in the sorted order) is kept in ends.
+
+        :return: Whether all jobs were distributed, and the resulting target function
+        """
+        t_m0 = self.t(0, i)
+        total = t_m0
+        self.ends = [i]
+
+        for _ in range(self.m - 1):
+            c, cost = self.fill(i, t_m0)
+            total += cost
+            i += c
+            self.ends.append(i)
+
+        return i == self.n, total
+
+    def fill(self, start, target):
+        """
+        Number of jobs from start on that a machine takes until its cost reaches target.
+
+        :return: The number of jobs and the cost of the machine holding them
+        """
+        rest = self.n - start
+        if target <= 0 or rest == 0: return 0, 0
+
+        # the machine holds the first lo jobs, which stay below target
+        machine = _Machine()
+        lo, hi = 0, 1
+        while True:
+            cost, batch = machine.probe(self.index[start + lo:start + hi], self.weight[start + lo:start + hi])
+            if cost >= target: break
+
+            machine.add(cost, batch)
+            if hi == rest: return rest, cost
+            lo, hi = hi, min(2 * hi, rest)
+
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            probed, batch = machine.probe(self.index[start + lo:start + mid], self.weight[start + lo:start + mid])
+            if probed < target:
+                machine.add(probed, batch)
+                lo = mid
+            else:
+                hi, cost = mid, probed
+
+        return hi, cost
+
+    def t(self, lo, hi):
+        return t(self.index[lo:hi], self.weight[lo:hi])
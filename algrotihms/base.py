@@ -1,4 +1,8 @@
 from collections import defaultdict
+import inspect
+import sys
+import time
+from math import prod
 from typing import Iterable
 
 import numpy as np
@@ -7,6 +11,14 @@ dtype = np.uint64
 dtype_max = np.iinfo(dtype).max
 
 
+def unreached():
+    """
+    Default value of DP states, a module level function so DP tables (and the solvers holding them)
+    can be pickled.
+    """
+    return dtype_max
+
+
 def inc(it, i):
     tmp = list(it)
     tmp[i] += 1
@@ -27,9 +39,24 @@ class Solver:
 
     t = w_sum
 
+    # whether batch_transform is faster than solving the instances one by one
+    batched = False
+
+    # whether jobs can be pushed one chunk at a time (start, push, finish)
+    online = False
+
     def __init__(self):
         self.n = None
         self.m = None
+        # machine of each job in the last transform, for solvers keeping it
+        self.assignment = None
+
+    def params(self) -> dict:
+        """
+        Parameters of the constructor, by name, which solvers keep in attributes of the same name.
+        """
+        names = inspect.signature(type(self).__init__).parameters
+        return {name: getattr(self, name) for name in sorted(names) if name != 'self'}
 
     def fit(self, n, m): pass
 
@@ -39,25 +66,94 @@ class Solver:
         self.fit(len(a), m)
         return self.transform(a)
 
+    def batch_transform(self, a, ms):
+        """
+        Values of a whole stack of instances for several numbers of machines.
+
+        :param a: Array of shape (..., n)
+        :param ms: Options for Numbers of Machines
+        :return: Array of shape (..., len(ms))
+        """
+        a = np.asarray(a)
+        flat = a.reshape(prod(a.shape[:-1]), a.shape[-1])
+        res = [[self.fit_transform(m, ai) for m in ms] for ai in flat]
+        return np.array(res, dtype=dtype).reshape(*a.shape[:-1], len(ms))
+
+    def start(self, m): pass
+
+    def push(self, chunk) -> list:
+        """
+        Schedule the jobs of chunk, as far as they can be decided yet.
+
+        :return: Machines of the jobs decided, in order
+        """
+        pass
+
+    def drain(self) -> list:
+        """
+        Decide all jobs pushed but not yet decided, as if no more jobs follow.
+
+        :return: Machines of the jobs decided, in order
+        """
+        return []
+
+    def finish(self) -> int:
+        """
+        :return: Target function of all jobs pushed
+        """
+        pass
+
+    def fit_transform_chunks(self, m, chunks) -> int:
+        """
+        Like fit_transform, for a sequence arriving in chunks (e.g. of a memory-mapped trace).
+        Online algorithms consume the chunks one by one, others need them concatenated.
+        """
+        if not self.online: return self.fit_transform(m, np.concatenate(list(chunks)))
+
+        self.start(m)
+        for chunk in chunks: self.push(chunk)
+        return self.finish()
+
 
 class DP(Solver):
+    """
+    Base of the exact DPs.
+
+    :param reconstruct: Also recover an optimal schedule (see algrotihms.hirschberg), stored as the
+                        machine of each job in assignment.
+
+    Set telemetry to an algrotihms.telemetry.Telemetry to record counters of each layer of step.
+    """
+
     name = "DP"
 
-    def __init__(self):
+    def __init__(self, reconstruct=False):
         super().__init__()
         self.dp = None
         self.positions = None
+        self.reconstruct = reconstruct
+        self.telemetry = None
+
+    def fit_transform(self, m, a) -> int:
+        if not self.reconstruct: return super().fit_transform(m, a)
+
+        from algrotihms.hirschberg import reconstruct
+        self.n, self.m = len(a), m
+        value, self.assignment = reconstruct(a, m)
+        return value
 
     def init_positions(self):
         root = tuple([0] * self.m)
         self.dp[root] = 0
         self.positions = [root]
+        if self.telemetry is not None: self.telemetry.clear()
 
     def step(self, ai, values=None, positions=None):
         if values is None: values = self.dp
         if positions is None: positions = self.positions
+        if self.telemetry is not None: start, job = time.perf_counter(), sum(positions[0]) + 1
 
-        next_values = defaultdict(lambda: dtype_max)
+        next_values = defaultdict(unreached)
         next_positions = set()
 
         for pos in positions:
@@ -67,6 +163,14 @@ class DP(Solver):
                     next_values[npos] = min(next_values[npos], values[pos] + npos[j] * ai)
                     next_positions.add(npos)
 
+        # each state has one successor per distinct count
+        if self.telemetry is not None: transitions = sum(len(set(pos)) for pos in positions)
+
         positions[:] = list(next_positions)
 
+        if self.telemetry is not None:
+            table = sys.getsizeof(next_values) + sys.getsizeof(positions) + len(positions) * sys.getsizeof(positions[0])
+            self.telemetry.record(job, states=len(positions), transitions=transitions,
+                                  merges=transitions - len(positions), bytes=table, time=time.perf_counter() - start)
+
         return next_values
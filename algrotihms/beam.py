@@ -0,0 +1,38 @@
+import heapq
+from collections import defaultdict
+
+from algrotihms.base import DP, unreached
+
+
+class BeamDP(DP):
+    """
+    DP keeping only the best width states (by value) per layer. Width 1 greedily commits to the
+    cheapest successor, no width is the exact DP. O(n * m * width) time.
+    The kept and dropped states per layer are kept in truncation.
+    """
+
+    name = "Beam DP"
+
+    def __init__(self, width=None):
+        super(BeamDP, self).__init__()
+        self.width = width
+        self.name = f"Beam DP {width}" if width else "Beam DP"
+        self.truncation = None
+
+    def fit(self, n, m):
+        self.n, self.m = n, m
+        self.dp = defaultdict(unreached)
+
+    def transform(self, a):
+        self.init_positions()
+        self.truncation = []
+
+        for ai in a:
+            self.dp = self.step(ai)
+            reached = len(self.positions)
+
+            if self.width is not None and reached > self.width:
+                self.positions[:] = heapq.nsmallest(self.width, self.positions, key=self.dp.__getitem__)
+            self.truncation.append((len(self.positions), reached - len(self.positions)))
+
+        return min(self.dp[i] for i in self.positions)
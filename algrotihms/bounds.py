@@ -0,0 +1,98 @@
+import heapq
+
+import numpy as np
+
+from algrotihms.base import dtype
+
+
+class SlotBound:
+    """
+    Admissible bound on the cost of scheduling the remaining jobs a[j:] from a state p.
+
+    Ignoring the precedence constraints, machine k offers the positions p_k + 1, p_k + 2, ...,
+    so the remaining cost is at least that of pairing the remaining weights decreasingly with the
+    smallest of these positions. Select the layer with layer(j), then the bound is O(m) per state
+    via prefix sums (with stride c for the levels where c machines are open).
+    """
+
+    def __init__(self, a, m):
+        self.a = np.asarray(a, dtype=np.int64)
+        self.m = m
+        self.tables = {}
+        self.r = None
+        self.ps = None
+        self.qs = None
+
+    def layer(self, j):
+        if j not in self.tables: self.tables[j] = self._tables(j)
+        self.r, self.ps, self.qs = self.tables[j]
+
+    def _tables(self, j):
+        r = len(self.a) - j
+
+        ps = np.zeros(r + self.m + 1, dtype=np.int64)
+        ps[1:r + 1] = np.cumsum(np.sort(self.a[j:])[::-1])
+        ps[r + 1:] = ps[r]
+
+        qs = [None]
+        for c in range(1, self.m + 1):
+            q = ps.copy()
+            for residue in range(c): q[residue::c] = np.cumsum(ps[residue::c])
+            qs.append(q.tolist())
+
+        return r, ps.tolist(), qs
+
+    def __call__(self, p):
+        m, r, ps = self.m, self.r, self.ps
+        s = cost = 0
+
+        for c in range(1, m + 1):
+            lo = p[m - c]
+            # levels lo + 1, ..., lo + k each offer c positions
+            k = -(-(r - s) // c)
+            if c < m: k = min(k, p[m - c - 1] - lo)
+            if k <= 0: continue
+
+            e, qs = s + c * k, self.qs[c]
+            cost += (lo + 1) * (ps[e] - ps[s]) + (k - 1) * ps[e] - (qs[e - c] - qs[s])
+
+            s = e
+            if s >= r: break
+
+        return cost
+
+
+def complete(p, a):
+    """
+    Cost of the remaining jobs a when greedily completing state p, always using the machine with
+    the fewest jobs. A feasible upper bound.
+    """
+    heap = list(p)
+    heapq.heapify(heap)
+
+    cost = 0
+    for ai in a:
+        position = heapq.heappop(heap) + 1
+        cost += int(ai) * position
+        heapq.heappush(heap, position)
+
+    return cost
+
+
+def lower_bound(a, ms):
+    """
+    Lower bound on the optimum of a whole stack of instances for several numbers of machines.
+
+    The SlotBound of the empty state: ignoring the precedence constraints, the weights are best paired
+    decreasingly with the positions 1 (m times), 2 (m times), ..., which costs the sum of every m-th
+    suffix sum of the decreasingly sorted weights. Exact for non-increasing instances.
+    O(n log n) per instance for sorting, then O(n / m) per m.
+
+    :param a: Array of shape (..., n)
+    :param ms: Options for Numbers of Machines
+    :return: Array of shape (..., len(ms))
+    """
+    ascending = np.cumsum(np.sort(np.asarray(a, dtype=dtype), axis=-1), axis=-1, dtype=dtype)
+    suffix = ascending[..., ::-1]
+
+    return np.stack([suffix[..., ::m].sum(axis=-1, dtype=dtype) for m in ms], axis=-1)
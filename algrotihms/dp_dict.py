@@ -1,20 +1,69 @@
+import time
 from collections import defaultdict
 
-from algrotihms.base import DP, dtype_max
+from algrotihms.base import DP, dtype, unreached
+from algrotihms.bounds import SlotBound, complete
+
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class DP_DICT(DP):
     """
     DP with dict. Less Space intensive, but a minimally higher complexity.
+
+    :param incumbent: Optional heuristic (e.g. LeastLoaded()) seeding an upper bound, which is tightened
+                      by greedily completing the most promising state of each layer. States whose value
+                      plus an admissible bound on the remaining jobs cannot beat it are pruned. The live
+                      and pruned states per layer are kept in pruning (and in the telemetry, if set, with
+                      the time spent on bounding added to each layer).
     """
 
     name = "DP"
 
+    def __init__(self, reconstruct=False, incumbent=None):
+        super().__init__(reconstruct)
+        self.incumbent = incumbent
+        self.pruning = None
+
     def fit(self, n, m):
         self.n, self.m = n, m
-        self.dp = defaultdict(lambda: dtype_max)
+        self.dp = defaultdict(unreached)
 
     def transform(self, a):
         self.init_positions()
+        if self.incumbent is not None: return self.branch_and_bound(a)
+
         for ai in a: self.dp = self.step(ai)
         return min(self.dp[i] for i in self.positions)
+
+    def branch_and_bound(self, a):
+        upper = dtype(self.incumbent.fit_transform(self.m, a))
+        bound = SlotBound(a, self.m)
+        self.pruning = []
+
+        for j, ai in enumerate(a, 1):
+            if not self.positions: break
+
+            self.dp = self.step(ai)
+            if self.telemetry is not None: start = time.perf_counter()
+
+            bound.layer(j)
+            lower = {p: self.dp[p] + bound(p) for p in self.positions}
+
+            best = min(lower, key=lower.get)
+            upper = min(upper, self.dp[best] + complete(best, a[j:]))
+
+            reached = len(self.positions)
+            self.positions[:] = [p for p in self.positions if lower[p] < upper]
+            self.pruning.append((len(self.positions), reached - len(self.positions)))
+
+            if self.telemetry is not None:
+                self.telemetry.update(pruned=reached - len(self.positions), time=time.perf_counter() - start)
+
+        logger.debug(f"{self.incumbent.name} bound {upper}: "
+                     f"at most {max((live for live, _ in self.pruning), default=1)} live states, "
+                     f"pruned {sum(pruned for _, pruned in self.pruning)}")
+
+        return min((self.dp[i] for i in self.positions), default=upper)
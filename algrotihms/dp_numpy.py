@@ -0,0 +1,110 @@
+import numpy as np
+
+from algrotihms.base import DP, dtype
+
+
+def radix(n, m):
+    """
+    Place values to encode count vectors with entries <= n as single integers.
+    None if the encoding does not fit into the dtype.
+    """
+    if (n + 1) ** m > np.iinfo(dtype).max: return None
+    return dtype(n + 1) ** np.arange(m - 1, -1, -1, dtype=dtype)
+
+
+def encode(states):
+    """
+    Encode each count vector as a single integer, mixed radix if it fits into the dtype.
+    """
+    base = int(states.max(initial=0)) + 1
+    keys = radix(base - 1, states.shape[1])
+
+    if keys is None: return np.unique(states, axis=0, return_inverse=True)[1].reshape(-1)
+    return states @ keys
+
+
+def successors(states, values, ai):
+    """
+    Expand a whole layer at once (with symmetry breaking). Successors are emitted machine by
+    machine, so for a key-sorted layer their keys form m sorted runs.
+
+    :return: Row of the source state, incremented machine and value of each successor
+    """
+    allowed = np.ones(states.shape, dtype=bool)
+    allowed[:, 1:] = states[:, 1:] < states[:, :-1]
+
+    j, src = np.nonzero(allowed.T)
+    return src, j, values[src] + (states[src, j] + 1) * dtype(ai)
+
+
+def materialize(states, src, j):
+    next_states = states[src]
+    next_states[np.arange(len(src)), j] += 1
+    return next_states
+
+
+def merge_min(keys, values):
+    """
+    Group equal keys and reduce their values by minimum.
+
+    :return: Index of one representative per key and the minimal value of each key (empty for
+             empty input, e.g. an empty key range of DP_PARALLEL)
+    """
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    starts = np.flatnonzero(np.r_[len(keys) > 0, keys[1:] != keys[:-1]])
+    return order[starts], np.minimum.reduceat(values[order], starts)
+
+
+def merge_argmin(keys, values):
+    """
+    Like merge_min, but the representative of each key is its first minimal entry.
+
+    :return: Index of the minimal entry per key
+    """
+    order = np.lexsort((values, keys))
+    keys = keys[order]
+    return order[np.flatnonzero(np.r_[len(keys) > 0, keys[1:] != keys[:-1]])]
+
+
+class DP_NUMPY(DP):
+    """
+    DP with each layer held as numpy arrays (sorted count vectors, their keys and values).
+    Successors are generated in bulk and duplicates merged by a vectorized min-reduction.
+    """
+
+    name = "Vectorized DP"
+
+    def __init__(self, reconstruct=False):
+        super().__init__(reconstruct)
+        self.keys = None
+        self.radix = None
+
+    def fit(self, n, m):
+        self.n, self.m = n, m
+        self.radix = radix(n, m)
+
+    def init_positions(self):
+        self.positions = np.zeros((1, self.m), dtype=dtype)
+        self.keys = np.zeros(1, dtype=dtype)
+        self.dp = np.zeros(1, dtype=dtype)
+
+    def step(self, ai):
+        src, j, next_values = successors(self.positions, self.dp, ai)
+
+        if self.radix is None:
+            next_positions = materialize(self.positions, src, j)
+            rep, next_values = merge_min(encode(next_positions), next_values)
+            self.positions = next_positions[rep]
+        else:
+            keys = self.keys[src] + self.radix[j]
+            rep, next_values = merge_min(keys, next_values)
+            self.positions = materialize(self.positions, src[rep], j[rep])
+            self.keys = keys[rep]
+
+        return next_values
+
+    def transform(self, a):
+        self.init_positions()
+        for ai in a: self.dp = self.step(ai)
+        return self.dp.min()
@@ -0,0 +1,141 @@
+import os
+import secrets
+
+from multiprocessing import Pool, resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from algrotihms.base import dtype
+from algrotihms.dp_numpy import DP_NUMPY, successors, materialize, merge_min
+
+
+def _create(size, m, name=None):
+    shm = SharedMemory(name, create=True, size=max(size * (m + 2) * dtype().itemsize, 1))
+    return shm, np.ndarray((size, m + 2), dtype=dtype, buffer=shm.buf)
+
+
+def _attach(name, size, m):
+    shm = SharedMemory(name=name)
+    return shm, np.ndarray((size, m + 2), dtype=dtype, buffer=shm.buf)
+
+
+def _release(name):
+    """
+    Release a block, if it (still) exists.
+    """
+    try:
+        shm = SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+
+    shm.close()
+    shm.unlink()
+
+
+def _collect(name, size, m):
+    """
+    Copy a block out of shared memory and release it.
+    """
+    shm, block = _attach(name, size, m)
+    block = block.copy()
+    shm.close()
+    shm.unlink()
+    return block
+
+
+def _expand(name, size, m, lo, hi, ai, radix, bounds, out):
+    """
+    Worker: expand rows lo:hi of the layer, merge locally and cut the (key sorted) result into
+    the key ranges given by bounds, in the block named out.
+    """
+    shm, layer = _attach(name, size, m)
+    states, keys, values = layer[lo:hi, :m], layer[lo:hi, m], layer[lo:hi, m + 1]
+
+    src, j, next_values = successors(states, values, ai)
+    next_keys = keys[src] + radix[j]
+    rep, next_values = merge_min(next_keys, next_values)
+
+    out, block = _create(len(rep), m, out)
+    block[:, :m] = materialize(states, src[rep], j[rep])
+    block[:, m] = next_keys[rep]
+    block[:, m + 1] = next_values
+
+    cuts = [0, *np.searchsorted(block[:, m], bounds).tolist(), len(rep)]
+
+    del states, keys, values, layer, block
+    shm.close()
+    out.close()
+    return out.name, len(rep), cuts
+
+
+def _merge(m, parts, b, out):
+    """
+    Worker: merge the b-th key range (which may be empty) of all expanded parts, in the block named out.
+    """
+    shms, blocks = zip(*(_attach(name, size, m) for name, size, _ in parts))
+    rows = np.concatenate([block[cuts[b]:cuts[b + 1]] for block, (_, _, cuts) in zip(blocks, parts)])
+    del blocks
+    rep, values = merge_min(rows[:, m], rows[:, m + 1])
+
+    out, block = _create(len(rep), m, out)
+    block[:, :m + 1] = rows[rep, :m + 1]
+    block[:, m + 1] = values
+
+    del block
+    for shm in shms: shm.close()
+    out.close()
+    return out.name, len(rep)
+
+
+class DP_PARALLEL(DP_NUMPY):
+    """
+    Vectorized DP with large layers sharded across a process pool via shared memory. Each worker
+    expands and locally min-merges its shard, then each worker merges one key range of all shards.
+    Small layers (or keys not fitting the dtype) are expanded serially.
+    """
+
+    name = "Parallel DP"
+
+    serial_below = 1 << 15
+
+    def __init__(self, workers=None, reconstruct=False):
+        super().__init__(reconstruct)
+        self.workers = workers or os.cpu_count()
+        self.pool = None
+
+    def step(self, ai):
+        if self.radix is None or len(self.positions) < self.serial_below: return super().step(ai)
+
+        m, size = self.m, len(self.positions)
+        workers = min(self.workers, size)
+        shm, shared = _create(size, m)
+        shared[:, :m], shared[:, m], shared[:, m + 1] = self.positions, self.keys, self.dp
+
+        # the layer is key sorted and successors only shift keys a little, so use its quantiles
+        cuts = np.linspace(0, size, workers + 1).astype(int)
+        bounds = self.keys[cuts[1:-1]]
+
+        # blocks of the workers are named up front, so they are released even if a worker fails
+        token = secrets.token_hex(4)
+        expanded, merged = [f"psm_{token}_e{k}" for k in range(workers)], [f"psm_{token}_m{b}" for b in range(workers)]
+
+        try:
+            parts = self.pool.starmap(_expand, [(shm.name, size, m, lo, hi, ai, self.radix, bounds, out)
+                                                for lo, hi, out in zip(cuts[:-1], cuts[1:], expanded)])
+            sizes = self.pool.starmap(_merge, [(m, parts, b, out) for b, out in enumerate(merged)])
+            layer = np.concatenate([_collect(name, size, m) for name, size in sizes])
+        finally:
+            del shared
+            shm.close()
+            shm.unlink()
+            for name in expanded + merged: _release(name)
+
+        self.positions, self.keys = layer[:, :m], layer[:, m]
+        return layer[:, m + 1]
+
+    def transform(self, a):
+        # workers have to share the tracker, as the parent unlinks the blocks they create
+        resource_tracker.ensure_running()
+        with Pool(self.workers) as self.pool:
+            return super().transform(a)
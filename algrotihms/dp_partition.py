@@ -0,0 +1,57 @@
+import numpy as np
+
+from algrotihms.base import DP, dtype, dtype_max
+from algrotihms.dp_numpy import successors, materialize, merge_min
+from algrotihms.partitions import partition_table, count, rank, unrank
+
+
+class DP_PARTITION(DP):
+    """
+    DP over dense per-layer indices. The states of layer j are exactly the partitions of j into at
+    most m parts, which are ranked and unranked instead of being stored. Only two flat value arrays
+    of size |L_n| and |L_{n-1}| are kept, i.e. the O(p_m(n) - p_m(n-2)) space bound.
+    """
+
+    name = "Partition DP"
+
+    chunk = 1 << 16
+
+    def __init__(self, reconstruct=False):
+        super().__init__(reconstruct)
+        self.table = None
+        self.layers = None
+
+    def fit(self, n, m):
+        self.n, self.m = n, m
+        self.table = partition_table(n, m)
+        self.layers = [np.empty(count(self.table, max(n - i, 0), m), dtype=dtype) for i in range(2)]
+
+    def size(self, j):
+        return count(self.table, j, self.m)
+
+    def layer(self, j):
+        return self.layers[(self.n - j) % 2][:self.size(j)]
+
+    def step(self, j, ai):
+        values, next_values = self.layer(j), self.layer(j + 1)
+        next_values[:] = dtype_max
+
+        for lo in range(0, len(values), self.chunk):
+            ranks = np.arange(lo, min(lo + self.chunk, len(values)))
+            states = unrank(self.table, ranks, j, self.m, dtype)
+
+            src, k, successor_values = successors(states, values[ranks], ai)
+            next_ranks = rank(self.table, materialize(states, src, k), j + 1)
+
+            rep, successor_values = merge_min(next_ranks, successor_values)
+            next_ranks = next_ranks[rep]
+            next_values[next_ranks] = np.minimum(next_values[next_ranks], successor_values)
+
+        return next_values
+
+    def transform(self, a):
+        self.dp = self.layer(0)
+        self.dp[0] = 0
+
+        for j, ai in enumerate(a): self.dp = self.step(j, ai)
+        return self.dp.min()
@@ -0,0 +1,73 @@
+import numpy as np
+
+
+class Fenwick:
+    """
+    Fenwick (binary indexed) trees over the positions 0, ..., size - 1, one per cell of shape.
+    Updates and prefix sums touch O(log size) nodes and cover all cells in one numpy operation.
+    """
+
+    def __init__(self, size, *shape):
+        self.tree = np.zeros((size + 1, *shape), dtype=np.int64)
+
+    @classmethod
+    def of(cls, values):
+        """
+        Trees holding values of shape (size, *shape), built level by level in O(size) instead of
+        size additions.
+        """
+        fenwick = cls(len(values), *np.shape(values)[1:])
+        tree = fenwick.tree
+        tree[1:] = values
+
+        # nodes whose lowest set bit is step are complete once the smaller levels were added
+        step = 1
+        while step < len(tree):
+            nodes = np.arange(step, len(tree) - step, 2 * step)
+            tree[nodes + step] += tree[nodes]
+            step *= 2
+
+        return fenwick
+
+    def add(self, i, delta, *where):
+        """
+        Add delta at position i to the cells selected by where.
+        """
+        self.tree[(self._up(i + 1), *where)] += delta
+
+    def prefix(self, i):
+        """
+        Sums over the positions before i, for all cells.
+        """
+        return self.tree[self._down(i)].sum(axis=0)
+
+    def prefixes(self, indices):
+        """
+        prefix for several positions at once.
+
+        :return: Array of shape (len(indices), *shape)
+        """
+        i = np.array(indices, dtype=np.int64)
+        nodes = np.zeros((len(i), max(len(self.tree) - 1, 1).bit_length()), dtype=np.int64)
+
+        # the empty node 0 pads paths shorter than the longest
+        for level in range(nodes.shape[1]):
+            nodes[:, level] = i
+            i -= i & -i
+
+        return self.tree[nodes].sum(axis=1)
+
+    def _up(self, i):
+        nodes = []
+        while i < len(self.tree):
+            nodes.append(i)
+            i += i & -i
+        return nodes
+
+    @staticmethod
+    def _down(i):
+        nodes = []
+        while i > 0:
+            nodes.append(i)
+            i -= i & -i
+        return nodes
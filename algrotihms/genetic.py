@@ -0,0 +1,148 @@
+import time
+
+import numpy as np
+
+from algrotihms.base import Solver
+from algrotihms.leastloaded import LeastLoaded
+
+
+def lineup(population):
+    """
+    Sort each schedule stably by machine, which lines every machine up in index order.
+
+    :return: The order, the sorted machines and whether a machine's segment starts at each entry
+    """
+    # a stable sort of small integers is a radix sort
+    order = np.argsort(population, axis=1, kind='stable')
+    machines = np.take_along_axis(population, order, axis=1)
+    starts = np.ones(population.shape, dtype=bool)
+    starts[:, 1:] = machines[:, 1:] != machines[:, :-1]
+    return order, machines, starts
+
+
+def fitness(population, w, lined_up=None):
+    """
+    Target function of a whole population of schedules in one pass, where the position of a job is
+    its distance to the start of its machine's segment in the lineup.
+
+    :param population: Machine of each job, array of shape (p, n)
+    :param w: Weights, array of shape (n,)
+    :param lined_up: lineup of the population, if already computed
+    :return: Array of shape (p,)
+    """
+    p, n = population.shape
+    if n == 0: return np.zeros(p, dtype=np.int64)
+
+    order, _, starts = lined_up or lineup(population)
+    index = np.broadcast_to(np.arange(n), (p, n))
+    positions = index - np.maximum.accumulate(np.where(starts, index, 0), axis=1) + 1
+
+    return (np.asarray(w, dtype=np.int64)[order] * positions).sum(axis=1)
+
+
+def canonical(population, m, lined_up=None):
+    """
+    Renumber the machines of every schedule by their first job, so that schedules equal up to the
+    numbering of the machines (which does not matter) are equal arrays and crossover combines
+    matching machines.
+    """
+    p, n = population.shape
+    order, machines, starts = lined_up or lineup(population)
+    rows, columns = np.nonzero(starts)
+
+    first = np.full((p, m), n)
+    first[rows, machines[rows, columns]] = order[rows, columns]
+
+    numbering = np.empty_like(population, shape=(p, m))
+    np.put_along_axis(numbering, np.argsort(first, axis=1), np.arange(m, dtype=population.dtype), axis=1)
+    return numbering[np.arange(p)[:, None], population]
+
+
+class GeneticAlgorithm(Solver):
+    """
+    Genetic algorithm over schedules encoded as the machine of each job (in index order on every
+    machine). The whole population is evaluated by fitness in one pass (sharing its sort by machine
+    with the renumbering by canonical), selection (binary
+    tournaments), two-point crossover and mutation (random machine per job with probability
+    mutation) are array operations over the population. The best individuals are kept (elitism).
+
+    The population starts from the schedules of the initial solvers, the rest is random. Stops after
+    the given generations or budget seconds. The best schedule is kept in assignment, and
+    (seconds, generation, value) of every new best in curve.
+
+    :param population: Number of individuals
+    :param generations: Generations to evolve
+    :param budget: Seconds to evolve at most, unbounded by default
+    :param mutation: Probability of each job to move to a random machine. Defaults to 1 / n.
+    :param elite: Number of best individuals carried over unchanged
+    :param initial: Solvers keeping an assignment, whose schedules are part of the initial population.
+                  Defaults to LeastLoaded.
+    :param seed: Seed of the random operations
+    """
+
+    name = "Genetic Algorithm"
+
+    def __init__(self, population=64, generations=200, budget=None, mutation=None, elite=2, initial=None, seed=0):
+        super().__init__()
+        self.population = population
+        self.generations = generations
+        self.budget = budget
+        self.mutation = mutation
+        self.elite = elite
+        self.initial = [LeastLoaded()] if initial is None else initial
+        self.seed = seed
+        self.name = (f"Genetic Algorithm ({', '.join(solver.name for solver in self.initial) or 'random'}; "
+                     f"population={population}, generations={generations}, budget={budget}, "
+                     f"mutation={mutation}, elite={elite}, seed={seed})")
+        self.curve = None
+
+    def fit(self, n, m):
+        self.n, self.m = n, m
+
+    def transform(self, a):
+        began = time.perf_counter()
+        n, m, size = self.n, self.m, self.population
+        w = np.asarray(a, dtype=np.int64)
+        rng = np.random.default_rng(self.seed)
+        mutation = self.mutation if self.mutation is not None else 1 / max(n, 1)
+
+        population = rng.integers(0, m, (size, n), dtype=np.min_scalar_type(m))
+        for k, solver in enumerate(self.initial[:size]):
+            solver.fit_transform(m, a)
+            population[k] = solver.assignment
+
+        lined_up = lineup(population)
+        population, values = canonical(population, m, lined_up), fitness(population, w, lined_up)
+        best = int(values.min())
+        self.assignment = population[values.argmin()].tolist()
+        self.curve = [(time.perf_counter() - began, 0, best)]
+
+        for generation in range(1, self.generations + 1):
+            if self.budget is not None and time.perf_counter() - began >= self.budget: break
+
+            # binary tournaments for both parents of every child
+            contestants = rng.integers(0, size, (2, size, 2))
+            winners = np.where(values[contestants[..., 0]] <= values[contestants[..., 1]],
+                               contestants[..., 0], contestants[..., 1])
+            mothers, fathers = population[winners[0]], population[winners[1]]
+
+            # two-point crossover: the father's jobs between both cut points
+            cuts = np.sort(rng.integers(0, n + 1, (size, 2)), axis=1)
+            between = (np.arange(n) >= cuts[:, :1]) & (np.arange(n) < cuts[:, 1:])
+            children = np.where(between, fathers, mothers)
+
+            mutated = rng.random((size, n)) < mutation
+            children[mutated] = rng.integers(0, m, np.count_nonzero(mutated), dtype=children.dtype)
+
+            elite = np.argsort(values)[:self.elite]
+            children[:len(elite)] = population[elite]
+
+            lined_up = lineup(children)
+            population, values = canonical(children, m, lined_up), fitness(children, w, lined_up)
+
+            if values.min() < best:
+                best = int(values.min())
+                self.assignment = population[values.argmin()].tolist()
+                self.curve.append((time.perf_counter() - began, generation, best))
+
+        return best
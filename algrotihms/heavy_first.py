@@ -1,11 +1,16 @@
-from algrotihms.base import Solver, decorate_sort
+import numpy as np
 
-from sortedcontainers import SortedList
+from algrotihms.base import Solver, decorate_sort
+from algrotihms.fenwick import Fenwick
 
 
 class HeavyFirst(Solver):
     """
     Decreasingly Sort a by weight then greedily insert to best position.
+
+    Inserting job i with weight w into a machine costs w times its new position plus the weight of
+    the machine's later jobs, which a Fenwick tree over job indices (count and weight per machine)
+    answers for all machines at once in O(log n).
     """
 
     name = "Heavy First"
@@ -13,28 +18,29 @@ class HeavyFirst(Solver):
     def __init__(self):
         super().__init__()
         self.v = None
-        self.t = lambda vs: Solver.t(vs, lambda v: v[1])
+        self.total = None
+        self.value = None
 
     def fit(self, n, m):
         self.n, self.m = n, m
-        self.v = [SortedList() for _ in range(m)]
+        self.v = Fenwick(n, m, 2)
+        self.total = np.zeros(m, dtype=np.int64)
+        self.value = 0
+        self.assignment = [None] * n
 
     def step(self, value):
-        best_index = None
-        best_diff = float('inf')
-
-        for i, slist in enumerate(self.v):
-            trial_list = SortedList(slist)
-            trial_list.add(value)
-
-            diff = self.t(trial_list) - self.t(slist)
+        i, w = value
+        w = int(w)
 
-            if diff < best_diff:
-                best_diff = diff
-                best_index = i
+        before = self.v.prefix(i)
+        diff = w * (before[:, 0] + 1) + self.total - before[:, 1]
+        best_index = int(np.argmin(diff))
 
-        self.v[best_index].add(value)
+        self.v.add(i, (1, w), best_index)
+        self.total[best_index] += w
+        self.value += int(diff[best_index])
+        self.assignment[i] = best_index
 
     def transform(self, a):
         for ai in decorate_sort(a): self.step(ai)
-        return sum(self.t(machine) for machine in self.v)
+        return self.value
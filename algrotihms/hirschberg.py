@@ -0,0 +1,131 @@
+import numpy as np
+
+from algrotihms.base import dtype
+from algrotihms.dp_numpy import encode, successors, materialize, merge_min, merge_argmin
+
+
+def predecessors(states, values, ai):
+    """
+    Inverse of successors: every state a whole layer can be reached from by scheduling a job of
+    weight ai, together with the cost of that job.
+
+    :return: Row of the target state, decremented machine and value of each predecessor
+    """
+    allowed = np.empty(states.shape, dtype=bool)
+    allowed[:, :-1] = states[:, :-1] > states[:, 1:]
+    allowed[:, -1] = states[:, -1] > 0
+
+    j, src = np.nonzero(allowed.T)
+    return src, j, values[src] + states[src, j] * dtype(ai)
+
+
+def forward(a, states, values, ceiling=None):
+    """
+    Run the DP over a starting from a layer, optionally dropping states that cannot reach ceiling.
+    """
+    for ai in a:
+        src, j, values = successors(states, values, ai)
+        states = materialize(states, src, j)
+
+        if ceiling is not None:
+            keep = (states <= ceiling).all(axis=1)
+            states, values = states[keep], values[keep]
+
+        rep, values = merge_min(encode(states), values)
+        states = states[rep]
+
+    return states, values
+
+
+def backward(a, end, floor):
+    """
+    Cost to go from every state of the layer len(a) jobs before end, which is reachable from floor.
+    """
+    states, values = end[None], np.zeros(1, dtype=dtype)
+
+    for ai in a[::-1]:
+        src, j, values = predecessors(states, values, ai)
+        states = states[src]
+        states[np.arange(len(src)), j] -= 1
+
+        keep = (states >= floor).all(axis=1)
+        states, values = states[keep], values[keep]
+
+        rep, values = merge_min(encode(states), values)
+        states = states[rep]
+
+    return states, values
+
+
+def meet(states, values, other_states, other_values):
+    """
+    The state on both layers minimizing the sum of both values.
+    """
+    keys = encode(np.concatenate([states, other_states]))
+    _, i, j = np.intersect1d(keys[:len(states)], keys[len(states):], return_indices=True)
+
+    best = np.argmin(values[i] + other_values[j])
+    return states[i[best]]
+
+
+def trace(a, start, end):
+    """
+    Optimal machines for a short sequence between two fixed states, by keeping all backpointers.
+    """
+    states, values = start[None], np.zeros(1, dtype=dtype)
+    pointers = []
+
+    for ai in a:
+        src, j, values = successors(states, values, ai)
+        states = materialize(states, src, j)
+
+        keep = np.flatnonzero((states <= end).all(axis=1))
+        keep = keep[merge_argmin(encode(states[keep]), values[keep])]
+        states, values = states[keep], values[keep]
+        pointers.append((src[keep], j[keep]))
+
+    row = int(np.flatnonzero((states == end).all(axis=1))[0])
+    machines = []
+    for src, j in reversed(pointers):
+        machines.append(int(j[row]))
+        row = src[row]
+
+    return machines[::-1]
+
+
+def solve(a, start, end, leaf=16):
+    """
+    Optimal machines for a between two fixed states by splitting a in half and recomputing the
+    halves (Hirschberg), keeping at most two layers at once.
+    """
+    if len(a) <= leaf: return trace(a, start, end)
+
+    mid = len(a) // 2
+    states, values = forward(a[:mid], start[None], np.zeros(1, dtype=dtype), end)
+    state = meet(states, values, *backward(a[mid:], end, start))
+
+    return solve(a[:mid], start, state, leaf) + solve(a[mid:], state, end, leaf)
+
+
+def reconstruct(a, m, leaf=16):
+    """
+    Optimal value and schedule of a using O(frontier) memory.
+
+    :param a: Weights
+    :param m: Number of Machines
+    :param leaf: Length below which backpointers are stored instead of splitting again
+    :return: Optimal value and the machine of each job. Machines are numbered as in the sorted
+             states of the DP, which never reorder.
+    """
+    a = np.asarray(a, dtype=dtype)
+    root = np.zeros((1, m), dtype=dtype)
+
+    mid = len(a) // 2
+    mid_states, mid_values = forward(a[:mid], root, np.zeros(1, dtype=dtype))
+    states, values = forward(a[mid:], mid_states, mid_values)
+
+    best = np.argmin(values)
+    end = states[best]
+    state = meet(mid_states, mid_values, *backward(a[mid:], end, root[0]))
+
+    return values[best], solve(a[:mid], root[0], state, leaf) + solve(a[mid:], state, end, leaf)
@@ -1,6 +1,10 @@
+import heapq
+from math import prod
 from queue import PriorityQueue as PQ
 
-from algrotihms.base import Solver
+import numpy as np
+
+from algrotihms.base import Solver, dtype, dtype_max
 
 
 class LeastLoaded(Solver):
@@ -10,21 +14,79 @@ class LeastLoaded(Solver):
 
     name = "Least Loaded"
 
+    batched = True
+
+    online = True
+
     def fit(self, n, m):
         self.n, self.m = n, m
         self.pq = PQ(maxsize=m)
-        for _ in range(m): self.pq.put((0, 0))
+        for j in range(m): self.pq.put((0, 0, j))
 
     def transform(self, a):
+        self.assignment = []
         for ai in a:
-            sum_wc, i = self.pq.get()
+            sum_wc, i, j = self.pq.get()
             i += 1
             sum_wc += ai * i
-            self.pq.put((sum_wc, i))
+            self.pq.put((sum_wc, i, j))
+            self.assignment.append(j)
 
         sum_wc = 0
         while not self.pq.empty():
-            partial_sum, _ = self.pq.get()
+            partial_sum, _, _ = self.pq.get()
             sum_wc += partial_sum
 
         return sum_wc
+
+    def start(self, m):
+        self.n, self.m = None, m
+        self.heap = [(0, 0, j) for j in range(m)]
+
+    def push(self, chunk):
+        heap, machines = self.heap, []
+        for ai in np.asarray(chunk, dtype=dtype).tolist():
+            sum_wc, i, j = heap[0]
+            heapq.heapreplace(heap, (sum_wc + ai * (i + 1), i + 1, j))
+            machines.append(j)
+
+        return machines
+
+    def finish(self):
+        return sum(sum_wc for sum_wc, _, _ in self.heap)
+
+    def batch_transform(self, a, ms):
+        """
+        All instances at once, without a heap. Each machine is one integer packing its load, its
+        number of jobs and its index, so the least loaded machine (ties broken by fewer jobs, as
+        the heap does) of every instance is a single minimum over the machine axis.
+        """
+        a = np.asarray(a, dtype=dtype)
+        n = a.shape[-1]
+        jobs = np.ascontiguousarray(a.reshape(prod(a.shape[:-1]), n).T)
+        size = jobs.shape[1]
+
+        res = np.empty((len(ms), size), dtype=dtype)
+        cols = np.arange(size)
+        one = dtype(1)
+
+        for k, m in enumerate(ms):
+            mb, cb = int(m - 1).bit_length(), int(n).bit_length()
+            if int(jobs.max(initial=0)) * n * (n + 1) // 2 >= int(dtype_max) >> (mb + cb):
+                return super().batch_transform(a, ms)
+
+            shift, inc = dtype(mb + cb), one << dtype(mb)
+            weights = jobs << shift
+            count_mask, machine_mask = (one << dtype(cb)) - one, inc - one
+
+            machines = np.arange(m, dtype=dtype)[:, None].repeat(size, axis=1)
+            flat = machines.reshape(-1)
+
+            for i in range(n):
+                key = machines.min(axis=0)
+                count = ((key >> dtype(mb)) & count_mask) + one
+                flat[(key & machine_mask).astype(np.int64) * size + cols] = key + weights[i] * count + inc
+
+            res[k] = (machines >> shift).sum(axis=0)
+
+        return res.T.reshape(*a.shape[:-1], len(ms))
@@ -0,0 +1,194 @@
+import time
+from collections import defaultdict
+from multiprocessing import Pool
+
+import numpy as np
+
+from algrotihms.base import DP, Solver, unreached
+from algrotihms.genetic import fitness
+from algrotihms.leastloaded import LeastLoaded
+
+
+def reoptimize(weights, counts, blocks=None, target=None):
+    """
+    Optimal schedule of a window of jobs with the DP.step recurrence, on machines already holding
+    counts jobs (of the prefix).
+
+    The jobs after the window form one block per machine, which may follow the window on any machine.
+    Each block's cost grows by its weight times the count it follows, so they are best paired heaviest
+    to least loaded. Then only the multiset of counts matters, i.e. the sorted states of the DP,
+    starting from the sorted counts. With target, the multiset of counts after the window is kept
+    instead, and each block follows a machine of the count it followed before, so its cost is kept.
+
+    :param weights: Weights of the jobs of the window
+    :param counts: Jobs per machine before the window
+    :param blocks: Weight of the jobs after the window per machine
+    :param target: Jobs per machine after the window, as they are
+    :return: Cost of the window (plus the weight of each block times the count it follows, unless
+             target is given), machine of each job of the window and machine each block moves to
+    """
+    counts = np.asarray(counts)
+    m = len(counts)
+
+    # machines as slots of the sorted states, which never reorder
+    order = np.argsort(-counts, kind='stable')
+    start = tuple(counts[order].tolist())
+
+    engine = DP()
+    values = defaultdict(unreached, {start: 0})
+    positions = [start]
+    layers = []
+
+    for ai in weights:
+        layers.append(values)
+        values = engine.step(ai, values, positions)
+
+    if target is not None:
+        end = tuple(sorted(np.asarray(target).tolist(), reverse=True))
+        cost = values[end]
+    else:
+        heaviest = sorted(blocks.tolist(), reverse=True)
+        cost, end = min((values[state] + sum(w * c for w, c in zip(heaviest, sorted(state))), state)
+                        for state in positions)
+
+    # backtrack the slot of every job
+    slots, state = [], end
+    for ai, previous in zip(reversed(weights), reversed(layers)):
+        for j in range(m):
+            before = state[:j] + (state[j] - 1,) + state[j + 1:]
+            if before in previous and previous[before] + state[j] * ai == values[state]:
+                slots.append(j)
+                state, values = before, previous
+                break
+
+    final = np.empty(m, dtype=np.int64)
+    final[order] = end
+
+    moves = np.empty(m, dtype=np.int64)
+    if target is not None: moves[np.argsort(-np.asarray(target), kind='stable')] = np.argsort(-final, kind='stable')
+    else: moves[np.argsort(-blocks, kind='stable')] = np.argsort(final, kind='stable')
+
+    return cost, order[slots[::-1]], moves
+
+
+def _window(w, machine, start, end, m, keep):
+    """
+    Current cost and reoptimize of the window [start, end) of a schedule.
+
+    :return: Current cost, cost, machines of the window and moves of the blocks as in reoptimize
+    """
+    counts = np.bincount(machine[:start], minlength=m)
+    blocks = np.zeros(m, dtype=np.int64)
+    np.add.at(blocks, machine[end:], w[end:])
+
+    # positions of the jobs of the window as they are
+    filled = counts.copy()
+    current = 0
+    for i in range(start, end):
+        filled[machine[i]] += 1
+        current += int(w[i]) * int(filled[machine[i]])
+
+    weights = w[start:end].tolist()
+    if keep: return (current, *reoptimize(weights, counts, target=filled))
+    return (current + int(blocks @ filled), *reoptimize(weights, counts, blocks))
+
+
+class LNS(Solver):
+    """
+    Large neighbourhood search: improves the schedule of another solver by freeing windows of
+    consecutive jobs and scheduling each one optimally (see reoptimize), which also moves the jobs
+    after the window to other machines, if they are better off there. Sweeps over the jobs with
+    windows overlapping by half, shifted randomly per sweep, until a sweep improves nothing, the
+    sweeps are done or budget seconds passed.
+
+    With several workers, the windows of a sweep are disjoint and solved in parallel. They are only
+    independent as long as the counts after each window stay the same (up to renumbering the machines
+    after it), so they are kept then.
+
+    A window costs one DP over its jobs, from the sorted counts before it. As these are rarely equal,
+    the states are up to the C(window + m - 1, m - 1) distributions of the window, so the window
+    should shrink as m grows. The best schedule is kept in assignment, and (seconds, sweep, value)
+    of every improving sweep in curve.
+
+    :param initial: Solver keeping an assignment, whose schedule is improved. Defaults to LeastLoaded.
+    :param window: Number of jobs freed at once
+    :param sweeps: Sweeps to do at most
+    :param budget: Seconds to search at most, unbounded by default
+    :param workers: Number of processes solving windows in parallel, sequential if 1
+    :param seed: Seed of the shifts of the windows
+    """
+
+    name = "LNS"
+
+    def __init__(self, initial=None, window=12, sweeps=10, budget=None, workers=1, seed=0):
+        super().__init__()
+        self.initial = initial or LeastLoaded()
+        self.window = window
+        self.sweeps = sweeps
+        self.budget = budget
+        self.workers = workers
+        self.seed = seed
+        self.name = (f"LNS {window} ({self.initial.name}; sweeps={sweeps}, budget={budget}, "
+                     f"workers={workers}, seed={seed})")
+        self.curve = None
+
+    def fit(self, n, m):
+        self.n, self.m = n, m
+
+    def transform(self, a):
+        began = time.perf_counter()
+
+        self.initial.fit_transform(self.m, a)
+        if self.initial.assignment is None: raise ValueError(f"{self.initial.name} does not keep an assignment")
+
+        w = np.asarray(a, dtype=np.int64)
+        machine = np.array(self.initial.assignment, dtype=np.int64)
+        value = int(fitness(machine[None], w)[0])
+        self.curve = [(time.perf_counter() - began, 0, value)]
+        rng = np.random.default_rng(self.seed)
+
+        if self.workers > 1:
+            with Pool(self.workers) as pool: value = self.search(w, machine, value, rng, began, pool)
+        else:
+            value = self.search(w, machine, value, rng, began)
+
+        self.assignment = machine.tolist()
+        return value
+
+    def search(self, w, machine, value, rng, began, pool=None):
+        n, m, size = self.n, self.m, self.window
+        stride = size if pool else max(size // 2, 1)
+
+        for sweep in range(1, self.sweeps + 1):
+            improved = False
+            starts = range(-int(rng.integers(0, stride)), n, stride)
+            windows = [(max(s, 0), min(s + size, n)) for s in starts if min(s + size, n) > max(s, 0)]
+
+            if pool:
+                results = pool.starmap(_window, [(w, machine, s, e, m, True) for s, e in windows])
+
+                # machines of the schedule the windows were solved on, as renumbered by the windows applied
+                numbering = np.arange(m)
+                for (s, e), (current, cost, jobs, moves) in zip(windows, results):
+                    if cost < current:
+                        machine[s:e] = numbering[jobs]
+                        renumbered = numbering[moves]
+                        relabel = np.empty(m, dtype=np.int64)
+                        relabel[numbering] = renumbered
+                        machine[e:] = relabel[machine[e:]]
+                        numbering = renumbered
+                        value, improved = value + cost - current, True
+            else:
+                for s, e in windows:
+                    if self.budget is not None and time.perf_counter() - began >= self.budget: break
+
+                    current, cost, jobs, moves = _window(w, machine, s, e, m, False)
+                    if cost < current:
+                        machine[s:e] = jobs
+                        machine[e:] = moves[machine[e:]]
+                        value, improved = value + cost - current, True
+
+            if improved: self.curve.append((time.perf_counter() - began, sweep, value))
+            if not improved or self.budget is not None and time.perf_counter() - began >= self.budget: break
+
+        return value
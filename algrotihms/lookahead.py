@@ -1,43 +1,123 @@
-from collections import defaultdict
+import time
+from collections import defaultdict, OrderedDict
 
-from algrotihms.base import DP, dtype_max
+import numpy as np
+
+from algrotihms.base import DP, dtype, inc, unreached
+from algrotihms.dp_numpy import successors, materialize, merge_min, encode
 
 
 class Lookahead(DP):
     """
     Greedy with DP based lookahead.
+
+    All candidates of a step share one vectorized DP over the horizon, whose values carry the
+    candidate they started from (value * m + candidate), so merging by min also breaks ties towards
+    the first candidate. Shifting all machine counts by the same amount shifts every horizon cost
+    equally, so decisions are memoized by the normalized state (counts minus the smallest) and the
+    weights of the window (bounded LRU, shared across calls), which makes repeated windows free.
+
+    With telemetry set, each decision computed records the totals of its horizon DP.
     """
 
     name = "Lookahead"
 
+    cache_size = 1 << 16
+
+    online = True
+
     def __init__(self, k):
         super(Lookahead, self).__init__()
         self.k = k
         self.name = f"Lookahead {k}"
+        self.cache = OrderedDict()
+        self.pos = None
+        self.value = None
+        self.pending = None
 
     def fit(self, n, m):
         self.n, self.m = n, m
-        self.dp = defaultdict(lambda: dtype_max)
+        self.dp = defaultdict(unreached)
 
     def transform(self, a):
         self.init_positions()
-        pos = self.positions[0]
+        self.pos, self.value = self.positions[0], self.dp[self.positions[0]]
+
+        self.assignment = [self.schedule(a[i:i + self.k]) for i in range(len(a))]
+
+        return self.value
+
+    def start(self, m):
+        self.fit(None, m)
+        self.init_positions()
+        self.pos, self.value = self.positions[0], self.dp[self.positions[0]]
+        self.pending = np.empty(0, dtype=dtype)
+
+    def push(self, chunk):
+        # a job is scheduled once its whole window arrived
+        self.pending = np.concatenate([self.pending, np.asarray(chunk, dtype=dtype)])
+        ready = max(len(self.pending) - self.k + 1, 0)
+
+        machines = [self.schedule(self.pending[i:i + self.k]) for i in range(ready)]
+        self.pending = self.pending[ready:]
+        return machines
+
+    def drain(self):
+        machines = [self.schedule(self.pending[i:]) for i in range(len(self.pending))]
+        self.pending = self.pending[:0]
+        return machines
+
+    def finish(self):
+        self.drain()
+        return self.value
+
+    def schedule(self, window):
+        """
+        Put the first job of window on the machine chosen by decide.
+
+        :return: The machine, numbered as the sorted states, which never reorder
+        """
+        window = tuple(window)
+        key = (tuple(p - self.pos[-1] for p in self.pos), window)
+
+        if key in self.cache:
+            self.cache.move_to_end(key)
+        else:
+            self.cache[key] = self.decide(self.pos, window)
+            if len(self.cache) > self.cache_size: self.cache.popitem(last=False)
+
+        j = self.cache[key]
+        self.pos = inc(self.pos, j)
+        self.value = self.value + self.pos[j] * window[0]
+        return j
+
+    def decide(self, pos, window):
+        """
+        Machine to put the first job of window on, such that the rest of the window can be
+        scheduled at minimal cost.
+        """
+        if self.telemetry is not None: start = time.perf_counter()
+
+        m = dtype(self.m)
+        states = np.array([pos], dtype=dtype)
 
-        for i, ai in enumerate(a):
-            self.positions = [pos]
-            step_dp = self.step(ai)
+        _, candidates, values = successors(states, np.zeros(1, dtype=dtype), window[0])
+        states = materialize(states, np.zeros_like(candidates), candidates)
+        values = values * m + np.arange(len(candidates), dtype=dtype)
+        counters = {'states': len(states), 'transitions': len(states), 'merges': 0, 'bytes': 0}
 
-            best = dtype_max
-            for pos_option, target in step_dp.items():
-                self.positions = [pos_option]
-                dp = {pos_option: target}
-                for w in a[i + 1:min(i + self.k, len(a))]: dp = self.step(w, dp)
+        for w in window[1:]:
+            src, j, values = successors(states, values, dtype(w) * m)
+            rep, values = merge_min(encode(materialize(states, src, j)), values)
+            states = materialize(states, src[rep], j[rep])
 
-                result = min(dp.values())
-                if result < best:
-                    pos = pos_option
-                    best = result
+            if self.telemetry is not None:
+                counters['states'] += len(rep)
+                counters['transitions'] += len(src)
+                counters['merges'] += len(src) - len(rep)
+                counters['bytes'] = max(counters['bytes'], states.nbytes + values.nbytes)
 
-            self.dp[pos] = step_dp[pos]
+        if self.telemetry is not None:
+            self.telemetry.record(sum(pos) + 1, **counters, time=time.perf_counter() - start)
 
-        return self.dp[pos]
+        return int(candidates[values.min() % m])
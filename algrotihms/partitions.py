@@ -0,0 +1,111 @@
+import numpy as np
+
+
+def partition_table(n, m):
+    """
+    Table P[k, s, b] of the number of partitions of s into at most k parts, each at most b.
+
+    :param n: Largest s (and b)
+    :param m: Largest k
+    :return: int64 array of shape (m + 1, n + 1, n + 1)
+    """
+    table = np.zeros((m + 1, n + 1, n + 1), dtype=np.int64)
+    table[0, 0, :] = 1
+
+    for k in range(1, m + 1):
+        for s in range(n + 1):
+            # the largest part v leaves s - v for at most k - 1 parts, each at most v
+            v = np.arange(s + 1)
+            cs = np.cumsum(table[k - 1, s - v, v])
+            table[k, s, :s + 1] = cs
+            table[k, s, s + 1:] = cs[-1]
+
+    return table
+
+
+def count(table, j, m):
+    """
+    p_m(j), the number of partitions of j into at most m parts.
+    """
+    return int(table[m, j, j])
+
+
+def rank(table, states, j):
+    """
+    Dense index of each non-increasing count vector summing to j within its layer.
+    Vectors are ordered decreasingly lexicographic, i.e. (j, 0, ..., 0) has rank 0.
+
+    :param table: Partition table of at least (m, j)
+    :param states: Array of shape (N, m)
+    :param j: Layer, the sum of each vector
+    :return: int64 array of shape (N,)
+    """
+    m = states.shape[1]
+    r = np.zeros(len(states), dtype=np.int64)
+    rem = np.full(len(states), j, dtype=np.int64)
+    bound = rem.copy()
+
+    for i in range(m - 1):
+        x = states[:, i].astype(np.int64)
+        top = np.minimum(bound, rem)
+        r += table[m - i, rem, top] - table[m - i, rem, x]
+        rem -= x
+        bound = x
+
+    return r
+
+
+def unrank(table, ranks, j, m, dtype=np.int64):
+    """
+    Inverse of rank.
+
+    :param table: Partition table of at least (m, j)
+    :param ranks: Array of shape (N,)
+    :param j: Layer, the sum of each vector
+    :param m: Number of parts
+    :param dtype: dtype of the returned vectors
+    :return: Array of shape (N, m)
+    """
+    states = np.zeros((len(ranks), m), dtype=dtype)
+    r = np.asarray(ranks, dtype=np.int64).copy()
+    rem = np.full(len(ranks), j, dtype=np.int64)
+    bound = rem.copy()
+
+    for i in range(m - 1):
+        k = m - i
+        top = np.minimum(bound, rem)
+        above = table[k, rem, top]
+
+        # smallest part x such that fewer than r vectors have a larger part here
+        lo, hi = np.zeros_like(top), top
+        for _ in range(int(j).bit_length()):
+            mid = (lo + hi) // 2
+            fits = above - table[k, rem, mid] <= r
+            hi = np.where(fits, mid, hi)
+            lo = np.where(fits, lo, mid + 1)
+
+        r -= above - table[k, rem, hi]
+        states[:, i] = hi
+        rem -= hi
+        bound = hi
+
+    states[:, m - 1] = rem
+    return states
+
+
+def layer_counts(n, m):
+    """
+    p_m(j) for j = 0, ..., n, the number of states in each layer of the DP over sorted count vectors.
+    As float64, since they outgrow any integer type for large n and m (inf beyond its range).
+
+    Partitions into at most m parts are those into parts of size at most m, so p_k(j) = p_{k-1}(j) + p_k(j - k),
+    a cumulative sum with stride k for each k. O(n * m) instead of the O(n^2 * m) partition_table.
+    """
+    counts = np.zeros(n + 1)
+    counts[0] = 1
+
+    with np.errstate(over='ignore', invalid='ignore'):
+        for k in range(1, m + 1):
+            for residue in range(k): counts[residue::k] = np.cumsum(counts[residue::k])
+
+    return counts
@@ -1,4 +1,5 @@
-from algrotihms.base import Solver, decorate_sort
+from math import prod
+from algrotihms.base import Solver, decorate_sort, dtype
 
 from sortedcontainers import SortedList
 
@@ -18,9 +19,44 @@ class SimpleSortAndSplit(Solver):
 
     name = "Simple Sort & Split"
 
+    batched = True
+
     def fit(self, n, m):
         self.n, self.m = n, m
 
     def transform(self, a):
-        machines = partition(decorate_sort(a), self.m)
+        jobs = decorate_sort(a)
+        machines = partition(jobs, self.m)
+
+        self.assignment = [None] * self.n
+        for j, indices in enumerate(np.array_split([i for i, _ in jobs], self.m)):
+            for i in indices: self.assignment[i] = j
+
         return sum(Solver.t(m) for m in machines)
+
+    def batch_transform(self, a, ms):
+        """
+        All instances at once. The split only depends on the rank of each job in the sorted order,
+        so sorting the jobs by their subarray (stable, i.e. by index within it) lines every machine
+        up and the target function becomes one weighted sum with fixed positions per m.
+        """
+        a = np.asarray(a, dtype=dtype)
+        n = a.shape[-1]
+        jobs = a.reshape(prod(a.shape[:-1]), n)
+
+        # stable non-increasing order, like decorate_sort
+        order = n - 1 - np.argsort(jobs[:, ::-1], axis=1, kind='stable')[:, ::-1]
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, np.broadcast_to(np.arange(n), order.shape), axis=1)
+
+        res = np.empty((len(jobs), len(ms)), dtype=dtype)
+        for k, m in enumerate(ms):
+            sizes = np.full(m, n // m)
+            sizes[:n % m] += 1
+            machine = np.repeat(np.arange(m, dtype=np.min_scalar_type(m)), sizes)
+            position = np.arange(n) - np.repeat(np.cumsum(sizes) - sizes, sizes) + 1
+
+            lined_up = np.argsort(machine[ranks], axis=1, kind='stable')
+            res[:, k] = np.take_along_axis(jobs, lined_up, axis=1) @ position.astype(dtype)
+
+        return res.reshape(*a.shape[:-1], len(ms))
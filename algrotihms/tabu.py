@@ -0,0 +1,159 @@
+import time
+
+import numpy as np
+
+from algrotihms.base import Solver
+from algrotihms.fenwick import Fenwick
+from algrotihms.leastloaded import LeastLoaded
+
+# delta of moves that are not to be applied
+INADMISSIBLE = np.iinfo(np.int64).max
+
+
+class TabuSearch(Solver):
+    """
+    Tabu search improving the schedule of another solver. Jobs stay in index order on every machine,
+    so a move (one job to another machine) or a swap (two jobs of different machines) only shifts
+    the positions of the later jobs of the machines involved.
+
+    Per machine, Fenwick trees over the job indices hold the number and weight of its jobs, so the
+    change of the target function of moving a job is O(log n) for all machines at once, and that
+    of a swap from the same two prefix sums.
+
+    Each iteration evaluates all moves of a few random jobs and as many random swaps, and applies the
+    best one, even if it is worse. Jobs moved within the last tenure iterations are tabu, unless
+    moving them again reaches a new best. Stops after budget seconds or the given iterations.
+    The best schedule is kept in assignment, and (seconds, iteration, value) of every new best in
+    curve, starting with the schedule of the initial solver.
+
+    :param initial: Solver keeping an assignment, whose schedule is improved. Defaults to LeastLoaded.
+    :param budget: Seconds to search
+    :param iterations: Iterations to search at most, unbounded by default
+    :param tenure: Iterations a moved job stays tabu
+    :param candidates: Jobs whose moves, and number of swaps, evaluated per iteration
+    :param seed: Seed of the random candidates
+    """
+
+    name = "Tabu Search"
+
+    def __init__(self, initial=None, budget=1.0, iterations=None, tenure=10, candidates=32, seed=0):
+        super().__init__()
+        self.initial = initial or LeastLoaded()
+        self.budget = budget
+        self.iterations = iterations
+        self.tenure = tenure
+        self.candidates = candidates
+        self.seed = seed
+        self.name = (f"Tabu Search ({self.initial.name}; budget={budget}, iterations={iterations}, "
+                     f"tenure={tenure}, candidates={candidates}, seed={seed})")
+        self.curve = None
+        self.trees = None
+        self.total = None
+        self.machine = None
+        self.w = None
+
+    def fit(self, n, m):
+        self.n, self.m = n, m
+
+    def transform(self, a):
+        began = time.perf_counter()
+
+        value = int(self.initial.fit_transform(self.m, a))
+        if self.initial.assignment is None: raise ValueError(f"{self.initial.name} does not keep an assignment")
+
+        self.w = np.asarray(a, dtype=np.int64)
+        self.machine = np.array(self.initial.assignment, dtype=np.int64)
+        self.assignment = list(self.initial.assignment)
+        self.curve = [(time.perf_counter() - began, 0, value)]
+        if self.n < 2 or self.m < 2: return value
+
+        cells = np.zeros((self.n, self.m, 2), dtype=np.int64)
+        cells[np.arange(self.n), self.machine] = np.stack([np.ones(self.n, dtype=np.int64), self.w], axis=1)
+        self.trees = Fenwick.of(cells)
+        self.total = cells[..., 1].sum(axis=0)
+
+        rng = np.random.default_rng(self.seed)
+        tabu = np.zeros(self.n, dtype=np.int64)
+        best = value
+        iteration = 0
+
+        while time.perf_counter() - began < self.budget and iteration != self.iterations:
+            iteration += 1
+
+            jobs = rng.integers(0, self.n, self.candidates)
+            moves = self.move(jobs)
+            moves[(tabu[jobs] >= iteration)[:, None] & (value + moves >= best)] = INADMISSIBLE
+            moves[np.arange(len(jobs)), self.machine[jobs]] = INADMISSIBLE
+
+            pairs = rng.integers(0, self.n, (2, self.candidates))
+            pairs = pairs[:, self.machine[pairs[0]] != self.machine[pairs[1]]]
+            swaps = self.swap(*pairs)
+            swaps[(tabu[pairs].max(axis=0, initial=0) >= iteration) & (value + swaps >= best)] = INADMISSIBLE
+
+            # (delta, relocations of jobs to machines) of the best move and the best swap
+            x, q = np.unravel_index(np.argmin(moves), moves.shape)
+            options = [(moves[x, q], [(jobs[x], q)])]
+            if len(swaps):
+                x = np.argmin(swaps)
+                i, k = pairs[:, x]
+                options.append((swaps[x], [(i, self.machine[k]), (k, self.machine[i])]))
+
+            delta, relocations = min(options, key=lambda option: option[0])
+            if delta == INADMISSIBLE: continue
+
+            for j, q in relocations:
+                self.relocate(j, q)
+                tabu[j] = iteration + self.tenure
+            value += int(delta)
+
+            if value < best:
+                best = value
+                self.assignment = self.machine.tolist()
+                self.curve.append((time.perf_counter() - began, iteration, best))
+
+        return best
+
+    def relocate(self, i, q):
+        p, w = self.machine[i], self.w[i]
+        self.trees.add(i, (-1, -w), p)
+        self.trees.add(i, (1, w), q)
+        self.total[p] -= w
+        self.total[q] += w
+        self.machine[i] = q
+
+    def queries(self, jobs):
+        """
+        Number of jobs before and weight of jobs after each of jobs (excluding itself) of every machine.
+
+        :return: Two arrays of shape (len(jobs), m)
+        """
+        before = self.trees.prefixes(jobs)
+        after = self.total - before[..., 1]
+        after[np.arange(len(jobs)), self.machine[jobs]] -= self.w[jobs]
+        return before[..., 0], after
+
+    def move(self, jobs):
+        """
+        Change of the target function when moving each of jobs to each machine (0 for its own).
+
+        :return: Array of shape (len(jobs), m)
+        """
+        count, after = self.queries(jobs)
+        cost = self.w[jobs, None] * (count + 1) + after
+        return cost - cost[np.arange(len(jobs)), self.machine[jobs], None]
+
+    def swap(self, first, second):
+        """
+        Change of the target function when exchanging the machines of the jobs first[x] and second[x],
+        which are on different machines, for each x.
+        """
+        i, k = np.minimum(first, second), np.maximum(first, second)
+        p, q = self.machine[i], self.machine[k]
+        count_i, after_i = self.queries(i)
+        count_k, after_k = self.queries(k)
+        x = np.arange(len(i))
+
+        # i moves first (k still on q), then k moves into p, which lost i before it
+        moved_i = self.w[i] * (count_i[x, q] - count_i[x, p]) + after_i[x, q] - after_i[x, p]
+        moved_k = self.w[k] * (count_k[x, p] - count_k[x, q] - 2) + after_k[x, p] - after_k[x, q]
+        return moved_i + moved_k
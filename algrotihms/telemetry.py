@@ -0,0 +1,75 @@
+from math import factorial
+
+import numpy as np
+import xarray as xr
+
+from algrotihms.partitions import layer_counts
+
+# recorded per layer, with their units
+COUNTERS = {'states': None, 'transitions': None, 'merges': None, 'pruned': None, 'bytes': 'B', 'time': 's'}
+
+
+class Telemetry:
+    """
+    Counters of the last run of a DP, one row per layer (i.e. per job j, after scheduling a[:j]):
+    - states: states reached
+    - transitions: successors generated
+    - merges: successors reaching an already reached state
+    - pruned: states dropped by the bounds of DP_DICT
+    - bytes: size of the layer's table (containers and states, not shared values)
+    - time: seconds spent on the layer
+
+    Solvers only record while their telemetry is set, e.g. algo.telemetry = Telemetry(), so it costs
+    a single check per layer otherwise. Lookahead records one row per decision it computes (not per
+    memoized one), totalled over its horizon DP.
+    """
+
+    def __init__(self):
+        self.jobs = []
+        self.rows = []
+
+    def clear(self):
+        self.jobs, self.rows = [], []
+
+    def record(self, job, **counters):
+        self.jobs.append(job)
+        self.rows.append([counters.get(name, 0) for name in COUNTERS])
+
+    def update(self, **counters):
+        """
+        Add to the counters of the last layer.
+        """
+        for i, name in enumerate(COUNTERS):
+            if name in counters: self.rows[-1][i] += counters[name]
+
+    def dataset(self):
+        """
+        :return: Dataset of the COUNTERS with a job dimension
+        """
+        rows = np.array(self.rows, dtype=float).reshape(-1, len(COUNTERS))
+
+        return xr.Dataset({name: xr.DataArray(rows[:, i], coords={'job': self.jobs}, dims=['job'],
+                                              attrs={'units': unit} if unit else {})
+                           for i, (name, unit) in enumerate(COUNTERS.items())})
+
+
+def compare(measured, n, m):
+    """
+    Put measured counters of the exact DP next to the theory: layer j holds at most p_m(j) states (the
+    partitions of j into at most m parts), and the whole run O(n^m / (m!)^2) of them.
+
+    :param measured: Dataset of Telemetry.dataset
+    :param n: Number of Jobs
+    :param m: Number of Machines
+    :return: The dataset with the partitions per layer, the share of them reached (occupancy), and
+             the measured and theoretical totals as attributes
+    """
+    partitions = layer_counts(n, m)[measured['job'].values]
+
+    return measured.assign(partitions=('job', partitions),
+                           occupancy=measured['states'] / partitions).assign_attrs(
+        states=float(measured['states'].sum()),
+        transitions=float(measured['transitions'].sum()),
+        partitions=float(partitions.sum()),
+        bound=n ** m / factorial(m) ** 2)
+
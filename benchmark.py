@@ -1,23 +1,27 @@
 from algrotihms import DP_DICT
 
-import xarray as xr
-from computer import _compute_solutions
+from computer import _compute_solutions, compute_lower_bounds
+from generator import generate
+from oracle import Oracle
 
 import logging
 
 logger = logging.getLogger(__name__)
 
 MSG1 = ''' Compute the Average Quality per Generator Type and Number of Machines '''
+MSG2 = ''' Compute the Average Certified Gap per Generator Type and Number of Machines '''
 
 
-def average_quality_per_generator(algo, n, ms, use_precomputed=True):
+def average_quality_per_generator(algo, n, ms, use_precomputed=True, oracle=None):
     """
     Compute the Average Quality per Generator Type and Number of Machines
 
     :param algo: The algorithm to compare
     :param n: Number of jobs
     :param ms: Options for Number of Machines
-    :param use_precomputed: Whether to use precomputed solutions
+    :param use_precomputed: Whether to use precomputed solutions (computing and storing only the
+                            missing ones), or to recompute all of them
+    :param oracle: Oracle providing the precomputed solutions. Defaults to one on ./precomputed
     :return: Average quality per Number of Machines per generator type
     """
     logger.info(f"{'':=^150}")
@@ -25,13 +29,33 @@ def average_quality_per_generator(algo, n, ms, use_precomputed=True):
     logger.info(f"{'':=^150}")
 
     if use_precomputed:
-        optimal = xr.open_dataarray("precomputed/dictionary-dp.nc")
-        assert n in optimal.coords['n'] and all(m in optimal.coords['m'] for m in ms), \
-            "Precomputed Solutions do not cover selected Parameters n and m"
-        optimal = optimal.loc[n]
+        optimal = (oracle or Oracle()).optimal(n, ms)
     else:
         optimal = _compute_solutions(DP_DICT(), n, ms)
     result = _compute_solutions(algo, n, ms)
 
     quality_per_instance = result / optimal
     return quality_per_instance.mean(axis=2).squeeze()
+
+
+def average_certified_gap_per_generator(algo, n, ms, seeds=range(10)):
+    """
+    Compute the Average Certified Gap per Generator Type and Number of Machines, against lower bounds
+    instead of optimal values, so n and m may be far beyond the reach of the DPs
+
+    :param algo: The algorithm to evaluate
+    :param n: Number of jobs
+    :param ms: Options for Number of Machines
+    :param seeds: Which seeds to use
+    :return: Average of solution / lower bound - 1 (at least the gap to the optimum) per Number of
+             Machines per generator type
+    """
+    logger.info(f"{'':=^150}")
+    logger.info(f"{MSG2:=^150}")
+    logger.info(f"{'':=^150}")
+
+    lower = compute_lower_bounds(generate(n, seeds), ms)
+    result = _compute_solutions(algo, n, ms, seeds)
+
+    gap_per_instance = result / lower - 1
+    return gap_per_instance.mean(axis=2).squeeze()
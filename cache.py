@@ -0,0 +1,108 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from algrotihms.base import Solver, dtype
+
+
+def describe(value):
+    """
+    Text of a parameter, where solvers (e.g. the one a local search starts from) are given by
+    their class and parameters.
+    """
+    if isinstance(value, Solver):
+        params = ', '.join(f"{name}={describe(v)}" for name, v in value.params().items())
+        return f"{type(value).__module__}.{type(value).__qualname__}({params})"
+    if isinstance(value, (list, tuple)): return f"[{', '.join(describe(v) for v in value)}]"
+    return repr(value)
+
+
+class ResultCache:
+    """
+    On-disk cache of solver results, keyed by a hash of the solver (class and constructor
+    parameters, see Solver.params), the instance and m. Least recently used entries are evicted
+    once more than max_entries are stored.
+
+    Backed by sqlite, so concurrent processes and threads (see computer.make_executor) may share one
+    file. Each thread of each process opens its own connection on first use, as sqlite connections
+    are bound to the thread that created them.
+
+    :param path: sqlite file
+    :param max_entries: Number of results to keep at most
+    """
+
+    def __init__(self, path="cache.sqlite", max_entries=1 << 20):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+
+    def __getstate__(self):
+        return {**self.__dict__, '_local': None}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    @property
+    def connection(self):
+        # a forked child inherits the thread locals of its parent, but must not use its connection
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            local.connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            local.connection.execute("PRAGMA journal_mode=WAL")
+            local.connection.execute("CREATE TABLE IF NOT EXISTS results "
+                                     "(key BLOB PRIMARY KEY, value BLOB, used INTEGER)")
+            local.connection.execute("CREATE INDEX IF NOT EXISTS lru ON results (used)")
+            local.pid = os.getpid()
+
+        return local.connection
+
+    @staticmethod
+    def key(algo, m, instance):
+        """
+        Content address of a cell. Instances are hashed in the common dtype, so lists and arrays
+        of the same weights share their results.
+        """
+        h = hashlib.sha256()
+        h.update(f"{describe(algo)}|{m}|".encode())
+        h.update(np.ascontiguousarray(instance, dtype=dtype).tobytes())
+        return h.digest()
+
+    @staticmethod
+    def cacheable(algo):
+        """
+        Whether the results of algo are reproducible, which they are not if it (or a solver it
+        starts from) stops on a time budget.
+        """
+        params = algo.params()
+        if params.get('budget') is not None: return False
+
+        nested = [v for value in params.values() for v in (value if isinstance(value, (list, tuple)) else [value])]
+        return all(ResultCache.cacheable(v) for v in nested if isinstance(v, Solver))
+
+    def get(self, key):
+        """
+        :return: The cached result, None if absent
+        """
+        row = self.connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None: return None
+
+        self.connection.execute("UPDATE results SET used = ? WHERE key = ?", (time.time_ns(), key))
+        return pickle.loads(row[0])
+
+    def put(self, key, value):
+        self.connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                                (key, pickle.dumps(value), time.time_ns()))
+
+        excess = self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self.connection.execute("DELETE FROM results WHERE key IN "
+                                    "(SELECT key FROM results ORDER BY used LIMIT ?)", (excess,))
+
+    def clear(self):
+        self.connection.execute("DELETE FROM results")
@@ -1,8 +1,16 @@
+from algrotihms.base import DP
+from algrotihms.bounds import lower_bound
+from cache import ResultCache
 from generator import generate
 
+import numpy as np
 import xarray as xr
 
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import multiprocessing as mp
+import copy
 import time
+import tracemalloc
 import logging
 
 logger = logging.getLogger("Runner")
@@ -10,31 +18,200 @@ logger = logging.getLogger("Runner")
 MSG1 = ''' Compute the Solutions per Number of Machines for multiple Weight Lists of a Generator Type '''
 MSG2 = ''' Compute the Average Value per Number of Machines per Generator Type '''
 
+# measured per cell when profiling, with their units
+PROFILE = {'wall_time': 's', 'cpu_time': 's', 'peak_memory': 'B'}
 
-def compute_single(instance, m, algo):
+# results of previous runs, consulted for every cell. None to always recompute
+cache = ResultCache()
+
+
+def compute_single(instance, m, algo, profile=False, cache=None):
     """
     Compute a single solution of an algorithm for set n, m, and Weight List a
 
     :param algo: Algorithm to run
     :param m: Number of Machines
     :param instance: List of Weights
-    :return: γ(algo, m, a)
+    :param profile: Also return the wall time, CPU time and peak of memory allocated meanwhile.
+                    Memory is traced by tracemalloc, which slows down allocation heavy algorithms,
+                    so in a second run of a new solver of the same parameters (see Solver.params).
+                    The times are those of the untraced run.
+    :param cache: ResultCache to look the solution up in first and store it to. Not used when
+                  profiling, for DPs reconstructing a schedule, as only the value is cached, or for
+                  solvers stopping on a time budget, whose results are not reproducible.
+    :return: γ(algo, m, a), if profiled with the measurements as in PROFILE
     """
     algo_name = algo.name
     logger.debug(f"a={instance}")
+
+    if profile or getattr(algo, 'reconstruct', False): cache = None
+    if cache is not None and not cache.cacheable(algo): cache = None
+    if cache is not None:
+        key = cache.key(algo, m, instance)
+        res = cache.get(key)
+        if res is not None:
+            logger.debug(f"γ({algo_name}, m:{m}, a) = {res}. Cached")
+            return res
+
     logger.debug(f"Calculate γ({algo_name}, m:{m}, a).")
 
-    start = time.perf_counter()
+    # memory is measured in a second run of a fresh solver, as tracing slows down the first
+    if profile: traced = type(algo)(**algo.params())
+
+    start, cpu_start = time.perf_counter(), time.process_time()
     res = algo.fit_transform(m, instance)
-    end = time.perf_counter()
+    end, cpu_end = time.perf_counter(), time.process_time()
+
+    if profile:
+        tracemalloc.start()
+        traced.fit_transform(m, instance)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
 
     logger.debug(f"γ({algo_name}, m:{m}, a) = {res}. Took {round(end - start, 3)} s")
 
-    return res
+    if cache is not None: cache.put(key, res)
+
+    return (res, end - start, cpu_end - cpu_start, peak) if profile else res
+
+
+def compute_batched(instances, ms, algo):
+    """
+    Compute the solutions of an algorithm for all instances and numbers of machines at once
+
+    :param algo: Algorithm to run, supporting batch_transform
+    :param ms: Options for Numbers of Machines
+    :param instances: DataArray of Weight Lists, as generated
+    :return: γ(algo, m, a) for each instance and m, with m as second axis
+    """
+    logger.debug(f"Calculate γ({algo.name}, m, a) for {instances[..., 0].size} a's and m in {list(ms)}.")
+
+    start = time.perf_counter()
+    res = algo.batch_transform(instances.values, ms)
+    end = time.perf_counter()
+
+    logger.debug(f"Batch of {algo.name} took {round(end - start, 3)} s")
+
+    return _layout(instances, ms, np.moveaxis(res, -1, 1))
+
+
+def compute_lower_bounds(instances, ms):
+    """
+    Compute lower bounds on the optimum of all instances and numbers of machines at once, see
+    algrotihms.bounds.lower_bound
+
+    :param ms: Options for Numbers of Machines
+    :param instances: DataArray of Weight Lists, as generated
+    :return: Lower bound for each instance and m, laid out as the solutions
+    """
+    return _layout(instances, ms, np.moveaxis(lower_bound(instances.values, ms), -1, 1))
+
+
+def _layout(instances, ms, values):
+    return instances.isel(a=0, drop=True).expand_dims(dim={'m': ms}, axis=1).copy(data=values)
+
+
+def make_executor(kind="serial", workers=None):
+    """
+    Create an executor to spread the cells of _compute_solutions across
+
+    :param kind: "serial", "thread" or "process". Processes are started from a forkserver, which
+                 already imported the algorithms.
+    :param workers: Number of workers. Defaults to the number of cores.
+    :return: The executor, None if serial
+    """
+    if kind == "serial": return None
+    if kind == "thread": return ThreadPoolExecutor(workers)
+    if kind == "process": return ProcessPoolExecutor(workers, mp_context=forkserver())
+
+    raise ValueError(f"Unknown executor {kind}")
 
 
-def _compute_solutions(algo, n, ms, seeds=range(10)):
-    instances = generate(n, seeds).expand_dims(dim={'m': ms}, axis=1)
+def forkserver():
+    """
+    multiprocessing context starting processes from a forkserver, which already imported the algorithms.
+    """
+    context = mp.get_context("forkserver")
+    context.set_forkserver_preload(["algrotihms", "computer"])
+    return context
+
+
+def _cost(algo, m):
+    """
+    Sort key putting the presumably slowest cells first: those of exact DPs, then of large m.
+    """
+    return not isinstance(algo, DP), -m
+
+
+def compute_seeds(instances, m, algo, profile=False, cache=None):
+    """
+    Compute the solutions of an algorithm for set m and several Weight Lists, in one go so that
+    they share the state of the algorithm (e.g. the cache of Lookahead)
+
+    :return: [γ(algo, m, a) for a in instances]
+    """
+    return [compute_single(instance, m, algo, profile, cache) for instance in instances]
+
+
+def submit_solutions(algorithms, instances, ms, executor=None, profile=False):
+    """
+    Submit the solutions of several algorithms for all instances, slowest cells first. A task
+    covers all seeds of one generator and m.
+
+    :param algorithms: Algorithms to calculate the values for
+    :param instances: DataArray of Weight Lists, as generated
+    :param ms: Options for Numbers of Machines
+    :param executor: Executor to run the tasks on, None to run them serially when collected
+    :param profile: Also measure each cell, see compute_single. Batched algorithms are then run
+                    cell by cell too.
+    :return: Per algorithm, a function waiting for and returning its solutions (and profile)
+    """
+    if profile and isinstance(executor, ThreadPoolExecutor):
+        raise ValueError("Profiling needs the cells to run one at a time per process")
+
+    ms = list(ms)
+    shape = instances.sizes['generator'], len(ms)
+    grid = [(i, g, k) for i, algo in enumerate(algorithms)
+            if executor is not None and (profile or not algo.batched) for g, k in np.ndindex(*shape)]
+
+    futures = {}
+    for i, g, k in sorted(grid, key=lambda task: _cost(algorithms[task[0]], ms[task[2]])):
+        # each task gets its own copy, as solvers keep state between fit and transform
+        futures[i, g, k] = executor.submit(compute_seeds, instances.values[g], ms[k], copy.deepcopy(algorithms[i]),
+                                           profile, cache)
+
+    def collect(i):
+        algo = algorithms[i]
+        if not profile and algo.batched: return compute_batched(instances, ms, algo)
+        if not profile and executor is None: return _apply(instances, ms, algo)
+
+        if executor is None:
+            cells = [compute_seeds(instances.values[g], ms[k], algo, profile, cache) for g, k in np.ndindex(*shape)]
+        else:
+            cells = [futures[i, g, k].result() for g, k in np.ndindex(*shape)]
+
+        if not profile: return _layout(instances, ms, np.array(cells).reshape(*shape, -1))
+        return _profiled(instances, ms, [cell for seeds in cells for cell in seeds])
+
+    return [lambda i=i: collect(i) for i in range(len(algorithms))]
+
+
+def _profiled(instances, ms, cells):
+    """
+    Split profiled cells into the solutions and a Dataset of their measurements.
+    """
+    shape = instances.sizes['generator'], len(ms), instances.sizes['seed']
+    values, *measurements = zip(*cells)
+
+    solutions = _layout(instances, ms, np.array(values).reshape(shape))
+    profile = xr.Dataset({name: solutions.copy(data=np.array(measured).reshape(shape)).assign_attrs(units=unit)
+                          for (name, unit), measured in zip(PROFILE.items(), measurements)})
+
+    return solutions, profile
+
+
+def _apply(instances, ms, algo):
+    instances = instances.expand_dims(dim={'m': ms}, axis=1)
 
     return xr.apply_ufunc(
         compute_single,
@@ -42,11 +219,16 @@ def _compute_solutions(algo, n, ms, seeds=range(10)):
         instances['m'],
         input_core_dims=[['a'], []],
         vectorize=True,
-        kwargs={'algo': algo},
+        kwargs={'algo': algo, 'cache': cache},
     )
 
 
-def compute_solutions(algo, n, ms, seeds=range(10)):
+def _compute_solutions(algo, n, ms, seeds=range(10), executor=None, profile=False):
+    collect, = submit_solutions([algo], generate(n, seeds), ms, executor, profile)
+    return collect()
+
+
+def compute_solutions(algo, n, ms, seeds=range(10), executor=None, profile=False):
     """
     Compute a 3D-Array with the following axes:
     1. Generator Type
@@ -59,15 +241,17 @@ def compute_solutions(algo, n, ms, seeds=range(10)):
     :param n: Number of Jobs
     :param ms: Options for Numbers of Machines
     :param seeds: Which seeds to use
+    :param executor: Executor to spread the cells across (see make_executor), None for serial
+    :param profile: Also return a Dataset of the wall time, CPU time and peak memory of each cell
     """
     logger.info(f"{'':=^150}")
     logger.info(f"{MSG1:=^150}")
     logger.info(f"{'':=^150}")
 
-    return _compute_solutions(algo, n, ms, seeds)
+    return _compute_solutions(algo, n, ms, seeds, executor, profile)
 
 
-def compute_averaged(algo, n, ms, seeds=range(10)):
+def compute_averaged(algo, n, ms, seeds=range(10), executor=None, profile=False):
     """
     Compute a 2D-Array with the following axes:
     1. Generator Type
@@ -77,9 +261,15 @@ def compute_averaged(algo, n, ms, seeds=range(10)):
     :param n: Number of Jobs
     :param ms: Options for Numbers of Machines
     :param seeds: Which seeds to use
+    :param executor: Executor to spread the cells across (see make_executor), None for serial
+    :param profile: Also return a Dataset of the wall time, CPU time and peak memory of each cell
+                    (not averaged)
     """
     logger.info(f"{'':=^150}")
     logger.info(f"{MSG2:=^150}")
     logger.info(f"{'':=^150}")
 
-    return _compute_solutions(algo, n, ms, seeds).mean(dim='seed')
+    if not profile: return _compute_solutions(algo, n, ms, seeds, executor).mean(dim='seed')
+
+    solutions, measured = _compute_solutions(algo, n, ms, seeds, executor, profile)
+    return solutions.mean(dim='seed'), measured
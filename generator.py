@@ -1,26 +1,49 @@
 import numpy as np
 
-from generators import generators as gs
+from generators import generators as gs, STREAM
 
 import xarray as xr
 
 from algrotihms.base import dtype
 
 
-def generate(n=150, seeds=range(10)):
+def generate(n=150, seeds=range(10), stream=STREAM):
     """
     Generate Lists of Weights for all generators and given seeds.
 
+    Every seed has its own random state (see generators.rng), so an instance only depends on its
+    generator, n and seed, and not on which other seeds are generated.
+
     :param n: Length of a's. Defaults to 150.
     :param seeds: Reproducibility Seeds. Defaults to [0, ..., 9]
+    :param stream: Random stream, see generators.rng. Recorded in the attributes.
     :return: DataArray with generated instances
     """
-    generator_names = [g.name for g in gs]
-    generator_random = [g.is_random for g in gs]
+    seeds = list(seeds)
+    data = np.empty((len(gs), len(seeds), n), dtype=dtype)
+
+    for g, data_g in zip(gs, data):
+        if not g.is_random: data_g[:] = g(n)
+        else:
+            for seed, row in zip(seeds, data_g): row[:] = g(n, seed, stream)
 
-    data = np.array([[g(n, seed) for seed in seeds] for g in gs], dtype=object)
     return xr.DataArray(data,
-                        coords={'generator': generator_names,
+                        coords={'generator': [g.name for g in gs],
                                 'seed': seeds,
-                                'randomized': ('generator', generator_random)},
-                        dims=['generator', 'seed', 'a']).astype(dtype)
+                                'randomized': ('generator', [g.is_random for g in gs])},
+                        dims=['generator', 'seed', 'a'],
+                        attrs={'stream': stream})
+
+
+def generate_chunks(n=150, seeds=range(10), stream=STREAM, max_bytes=1 << 28):
+    """
+    Generate the instances of generate in chunks of seeds, each holding at most max_bytes of
+    weights (but at least one seed), so that many long instances can be streamed.
+
+    :return: Iterator over DataArrays as returned by generate
+    """
+    seeds = list(seeds)
+    chunk = max(1, max_bytes // (len(gs) * n * dtype().itemsize))
+
+    for i in range(0, len(seeds), chunk):
+        yield generate(n, seeds[i:i + chunk], stream)
@@ -1,6 +1,27 @@
 import numpy as np
 from itertools import repeat
 
+# streams of random weights: "legacy" reproduces the former reseeding of np.random, "pcg64-v1"
+# draws seed s from SeedSequence(ENTROPY).spawn(s + 1)[s] (which needs no other seeds)
+LEGACY = "legacy"
+STREAM = "pcg64-v1"
+ENTROPY = 0
+
+
+def rng(seed, stream=STREAM):
+    """
+    Independent random state of a seed, not touching the global state of np.random.
+    """
+    if stream == LEGACY: return np.random.RandomState(seed)
+    if stream == STREAM: return np.random.Generator(np.random.PCG64(np.random.SeedSequence(ENTROPY, spawn_key=(seed,))))
+
+    raise ValueError(f"Unknown stream {stream}")
+
+
+def integers(rng, low, high, n):
+    if isinstance(rng, np.random.RandomState): return rng.randint(low, high, size=n)
+    return rng.integers(low, high, size=n)
+
 
 def constant(n):
     """
@@ -23,60 +44,57 @@ def decreasing(n):
     return increasing(n)[::-1]
 
 
-def small_random(n, seed):
+def small_random(n, rng):
     """
     Small Random Weights
     """
-    np.random.seed(seed)
-    return np.random.randint(1, 101, size=n)
+    return integers(rng, 1, 101, n)
 
 
-def small_span_large(n, seed):
+def small_span_large(n, rng):
     """
     Small Span Large Weights
     """
-    return small_random(n, seed) + 10_000
+    return small_random(n, rng) + 10_000
 
 
-def large_span_large(n, seed):
+def large_span_large(n, rng):
     """
     Large Span Large Weights
     """
-    np.random.seed(seed)
-    return np.random.randint(10_001, 1_000_001, size=n)
+    return integers(rng, 10_001, 1_000_001, n)
 
 
-def low_then_high(n, seed):
+def low_then_high(n, rng):
     """
     Random Half Low, then Half High Weights
     e.g. [920, 912, 945, ..., 24, 94, 56]
     """
-    a = small_random(n, seed)
+    a = small_random(n, rng)
     a[n // 2:] += 900
     return a
 
 
-def high_then_low(n, seed):
+def high_then_low(n, rng):
     """
     Random Half High, then Half Low Weights
     e.g. [24, 94, 56, ..., 920, 912, 945]
     """
-    return low_then_high(n, seed)[::-1]
+    return low_then_high(n, rng)[::-1]
 
 
-def large_span_random_non_decreasing(n, seed):
+def large_span_random_non_decreasing(n, rng):
     """
     Non-Decreasingly Sorted Large Span Random Weights
     """
-    np.random.seed(seed)
-    return np.sort(np.random.randint(1, 100_001, size=n))
+    return np.sort(integers(rng, 1, 100_001, n))
 
 
-def large_span_random_non_increasing(n, seed):
+def large_span_random_non_increasing(n, rng):
     """
     Non-Increasingly Sorted Large Span Random Weights
     """
-    return large_span_random_increasing(n, seed)[::-1]
+    return large_span_random_non_decreasing(n, rng)[::-1]
 
 
 class Generator:
@@ -85,8 +103,8 @@ class Generator:
         self.name = name
         self.is_random = is_random
 
-    def __call__(self, n, seed=None):
-        return self.gf(n, seed) if self.is_random else self.gf(n)
+    def __call__(self, n, seed=None, stream=STREAM):
+        return self.gf(n, rng(seed, stream)) if self.is_random else self.gf(n)
 
 
 all = [(constant, "Constant", False),
@@ -97,9 +115,9 @@ all = [(constant, "Constant", False),
        (large_span_large, "Random Large Span Large", True),
        (low_then_high, "Random Half Low, Half High", True),
        (high_then_low, "Random Half High, Half Low", True),
-       (large_span_random_increasing,
+       (large_span_random_non_decreasing,
         "Random Non-Decreasing Large Span", True),
-       (large_span_random_decreasing,
+       (large_span_random_non_increasing,
         "Random Non-Increasing Large Span", True)]
 
 generators = [Generator(*args) for args in all]
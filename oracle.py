@@ -0,0 +1,59 @@
+from algrotihms import DP_DICT, DP_MDIM, DP_NUMPY, DP_PARTITION, DP_PARALLEL, AStar
+
+from computer import _compute_solutions
+from store import ResultStore
+
+import xarray as xr
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# algorithms whose stored solutions are optimal
+EXACT = [algo.name for algo in (DP_DICT, DP_NUMPY, DP_PARTITION, DP_PARALLEL, DP_MDIM, AStar)]
+
+
+class Oracle:
+    """
+    Optimal values, read lazily from the stored blocks of any exact algorithm. Missing (n, m)
+    blocks are computed by the engine and written back, so later benchmarks find them.
+
+    :param store: ResultStore to read from and write to. Defaults to ./precomputed
+    :param engine: Exact algorithm computing missing blocks. Defaults to the vectorized DP.
+    """
+
+    def __init__(self, store=None, engine=None):
+        self.store = store or ResultStore()
+        self.engine = engine or DP_NUMPY()
+
+    def block(self, n, m, seeds):
+        """
+        Optimal values for one n and m, as memory-mapped (generator, seed) DataArray.
+        """
+        for name in EXACT:
+            if self.store.has(name, n, m, seeds): break
+        else:
+            # only the seeds missing from the engine's block are computed, and merged into it
+            name = self.engine.name
+            missing = self.store.missing(name, n, m, seeds)
+            logger.info(f"No optimal values stored for n={n}, m={m}, seeds {missing}. Compute with {name}")
+            self.store.write(name, n, m, _compute_solutions(self.engine, n, [m], missing).sel(m=m))
+
+        block = self.store.block(self.store.manifest(name, n, m))
+        return block.isel(algorithm=0, n=0, m=0, drop=True).sel(seed=list(seeds))
+
+    def optimal(self, n, ms, seeds=range(10), generators=None):
+        """
+        Optimal values, only computing the blocks not stored yet.
+
+        :param n: Number of Jobs
+        :param ms: Options for Numbers of Machines
+        :param seeds: Which seeds to use
+        :param generators: Names of the generators to select, all by default
+        :return: DataArray with generator, m and seed dimensions, as _compute_solutions
+        """
+        optimal = xr.concat([self.block(n, m, seeds) for m in ms], dim=xr.DataArray(list(ms), dims='m'))
+        optimal = optimal.transpose('generator', 'm', 'seed')
+
+        if generators is None: return optimal
+        return optimal.sel(generator=generators)
@@ -1,8 +1,9 @@
 from algrotihms import *
 
-from computer import compute_solutions
-
-import xarray as xr
+from computer import _cost, make_executor, submit_solutions
+from generator import generate
+from generators import STREAM
+from store import ResultStore
 
 import log
 import logging
@@ -10,39 +11,43 @@ import logging
 log.configure()
 
 
-def precompute(algorithms, n=150, ms=range(1, 7), seeds=range(10)):
-    file_name = "precomputed"
-    nc_file = file_name + ".nc"
-    csv_file = file_name + ".csv"
-
-    res = []
-
-    for algorithm in algorithms:
-        logging.info("Compute " + algorithm.name)
-        solutions = compute_solutions(algorithm, n, ms, seeds)
-        res += [solutions.expand_dims(algorithm=[algorithm.name], axis=0)]
-
-    da = xr.combine_by_coords(res)
-
+def precompute(algorithms, n=150, ms=range(1, 7), seeds=range(10), executor="process", workers=None,
+               profile=False, store=None, stream=STREAM):
+    """
+    Compute the solutions of all algorithms and commit each (algorithm, m) block to the store as
+    soon as it is done. Only the seeds not stored yet are computed and merged into their block, so
+    an interrupted run resumes and more seeds can be added later.
+
+    :param executor: "serial", "thread" or "process", see make_executor. All cells of all algorithms
+                     share one executor, slowest first.
+    :param workers: Number of workers of the executor
+    :param profile: Also measure runtime and memory of every cell and store them with the block. Each
+                    cell is then run twice (see computer.compute_single), one at a time, and neither
+                    batched nor cached.
+    :param store: ResultStore to write to. Defaults to ./precomputed
+    :param stream: Random stream to generate the instances with, see generators.rng
+    """
+    store = store or ResultStore()
+    instances = generate(n, seeds, stream)
+
+    blocks = [(algorithm, m, store.missing(algorithm.name, n, m, seeds, profile, stream))
+              for algorithm in algorithms for m in ms]
+    blocks = sorted([block for block in blocks if block[2]], key=lambda block: _cost(*block[:2]))
+    logging.info(f"{len(blocks)} of {len(algorithms) * len(ms)} blocks missing seeds")
+
+    pool = make_executor(executor, workers)
     try:
-        with xr.open_dataarray(nc_file) as full_data:
-            da = xr.concat([full_data, da], dim='algorithm').sortby('algorithm')
-            logging.info("Found previous data and merged")
-    except FileNotFoundError:
-        pass
-    except Exception as e:
-        nc_file = nc_file.replace(".nc", "-unmerged.nc")
-
-        logging.warning(e)
-        logging.info("Could not merge")
-        logging.warning(f"Will write to file {nc_file}, in order avoid overwriting previous data")
+        pending = [(algorithm, m, submit_solutions([algorithm], instances.sel(seed=missing), [m], pool, profile)[0])
+                   for algorithm, m, missing in blocks]
 
-    logging.info("Writing NetCDF")
-    da.to_netcdf(nc_file)
+        for algorithm, m, collect in pending:
+            solutions, measured = collect() if profile else (collect(), None)
+            if measured is not None: measured = measured.sel(m=m)
 
-    logging.info("Writing CSV")
-    df = da.stack(combined=da.dims).to_pandas()
-    df.to_csv(csv_file)
+            store.write(algorithm.name, n, m, solutions.sel(m=m), measured, stream)
+            logging.info(f"Stored {algorithm.name} for n={n}, m={m}")
+    finally:
+        if pool is not None: pool.shutdown(cancel_futures=True)
 
 
 if __name__ == "__main__":
@@ -52,6 +57,7 @@ if __name__ == "__main__":
         HeavyFirst(),
         Lookahead(5),
         Lookahead(15),
+        Lookahead(30),
         SimpleSortAndSplit(),
         BalancedSequentialInsert()
     ]
@@ -0,0 +1,242 @@
+import argparse
+import os
+import resource
+import signal
+import time
+from multiprocessing.connection import wait
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+from tabulate import tabulate
+
+from algrotihms import *
+from algrotihms.base import DP
+from algrotihms.partitions import layer_counts
+from computer import forkserver
+from generators import generators as gs, STREAM
+
+import log
+import logging
+
+logger = logging.getLogger("Scaling")
+
+MSG = ''' Measure the Scaling of the Solvers over Number of Jobs and Machines '''
+
+NS = [10, 30, 100, 300, 1_000, 3_000, 10_000, 30_000, 100_000]
+MS = [2, 3, 4, 8, 16, 32, 64]
+
+# seconds a single cell may take
+BUDGET = 60
+
+# how a cell ended. Cells dominated by one that timed out or failed are skipped
+OK, TIMEOUT, ERROR, SKIPPED = "ok", "timeout", "error", "skipped"
+
+MEASURES = {'value': None, 'wall_time': 's', 'cpu_time': 's', 'peak_memory': 'B', 'states': None}
+
+
+def suite():
+    """
+    One solver of every class exported by algrotihms, parametrized heuristics as in main.
+    """
+    return [DP_DICT(), DP_MDIM(), DP_NUMPY(), DP_PARTITION(), DP_PARALLEL(), AStar(), BeamDP(64),
+            LeastLoaded(), Lookahead(5), HeavyFirst(), SimpleSortAndSplit(), BalancedSequentialInsert(),
+            TabuSearch(budget=1), GeneticAlgorithm(), LNS(window=8, budget=10)]
+
+
+def states(algo, n, m):
+    """
+    Number of DP states a cell reached: from the bookkeeping of solvers keeping one (pruning of DP_DICT,
+    truncation of BeamDP, expanded of AStar), the whole layered state space for the other exact DPs,
+    NaN for heuristics.
+    """
+    if getattr(algo, 'pruning', None): return sum(live + pruned for live, pruned in algo.pruning)
+    if getattr(algo, 'truncation', None): return sum(kept + dropped for kept, dropped in algo.truncation)
+    if getattr(algo, 'expanded', None) is not None: return algo.expanded
+    if isinstance(algo, DP) and not isinstance(algo, Lookahead): return layer_counts(n, m)[1:].sum()
+    return np.nan
+
+
+def _run(connection, algo, m, instance):
+    # own process group, so pools the solver starts are stopped with it
+    os.setpgid(0, 0)
+
+    try:
+        start, cpu_start = time.perf_counter(), time.process_time()
+        res = algo.fit_transform(m, instance)
+        end, cpu_end = time.perf_counter(), time.process_time()
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        connection.send((OK, (int(res), end - start, cpu_end - cpu_start, peak, states(algo, len(instance), m))))
+    except Exception as e:
+        connection.send((ERROR, repr(e)))
+
+
+def measure(algo, m, instance, budget=BUDGET, context=None):
+    """
+    Run a single cell in a fresh process, killed once it exceeds the budget.
+
+    Peak memory is the maximum resident set size of that process, so it includes the interpreter
+    (but not the workers of DP_PARALLEL). Unlike computer.compute_single with profile, nothing is
+    traced, so the times are those of an undisturbed run.
+
+    :param algo: Algorithm to run
+    :param m: Number of Machines
+    :param instance: List of Weights
+    :param budget: Seconds the cell may take, including starting the process
+    :param context: multiprocessing context. Defaults to computer.forkserver
+    :return: Status and the measures as in MEASURES (NaN unless OK)
+    """
+    if context is None: context = forkserver()
+
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_run, args=(sender, algo, m, instance))
+    process.start()
+    sender.close()
+
+    ready = wait([receiver, process.sentinel], timeout=budget)
+
+    if receiver in ready:
+        status, result = receiver.recv()
+    else:
+        status, result = (TIMEOUT if not ready else ERROR), f"exit code {process.exitcode}"
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    process.join()
+    receiver.close()
+
+    if status != OK:
+        logger.info(f"{algo.name}, n={len(instance)}, m={m}: {status} ({result})")
+        return status, [np.nan] * len(MEASURES)
+
+    logger.info(f"{algo.name}, n={len(instance)}, m={m}: {round(result[1], 3)} s")
+    return status, result
+
+
+def scale(algorithms=None, ns=NS, ms=MS, budget=BUDGET, generator="Random Large Span Large", seed=0,
+          stream=STREAM):
+    """
+    Measure every algorithm on one instance per n, for every m, each cell within the time budget.
+
+    Cells are run by increasing n and m. Once a cell timed out or failed, those with at least its n
+    and m are skipped for that algorithm, as they would only take longer.
+
+    :param algorithms: Algorithms to measure. Defaults to the suite
+    :param ns: Options for Numbers of Jobs
+    :param ms: Options for Numbers of Machines
+    :param budget: Seconds a single cell may take
+    :param generator: Name of the generator of the instances
+    :param seed: Seed of the instances
+    :param stream: Random stream, see generators.rng
+    :return: Dataset with algorithm, n, m dimensions of the MEASURES and the status of each cell
+    """
+    logger.info(f"{'':=^150}")
+    logger.info(f"{MSG:=^150}")
+    logger.info(f"{'':=^150}")
+
+    algorithms = suite() if algorithms is None else algorithms
+    ns, ms = sorted(ns), sorted(ms)
+    g, = [g for g in gs if g.name == generator]
+    context = forkserver()
+
+    shape = len(algorithms), len(ns), len(ms)
+    measured = np.full((*shape, len(MEASURES)), np.nan)
+    status = np.full(shape, SKIPPED, dtype=object)
+
+    for i, algo in enumerate(algorithms):
+        stopped = []
+        for (k, n), (l, m) in ((kn, lm) for kn in enumerate(ns) for lm in enumerate(ms)):
+            if any(n >= n0 and m >= m0 for n0, m0 in stopped): continue
+
+            instance = g(n, seed, stream) if g.is_random else g(n)
+            status[i, k, l], measured[i, k, l] = measure(algo, m, instance, budget, context)
+            if status[i, k, l] != OK: stopped.append((n, m))
+
+    coords = {'algorithm': [algo.name for algo in algorithms], 'n': ns, 'm': ms}
+    dims = list(coords)
+
+    data = {name: xr.DataArray(measured[..., v], coords=coords, dims=dims, attrs={'units': unit} if unit else {})
+            for v, (name, unit) in enumerate(MEASURES.items())}
+    data['status'] = xr.DataArray(status.astype(str), coords=coords, dims=dims)
+
+    return xr.Dataset(data, attrs={'budget': budget, 'generator': generator, 'seed': seed, 'stream': stream})
+
+
+def frontier(results):
+    """
+    Largest n solved within the budget per algorithm and m, 0 if none.
+    """
+    solved = results['n'].where(results['status'] == OK)
+    return solved.max(dim='n').fillna(0).astype(int)
+
+
+def compare(results, baseline, tolerance=0.25, floor=0.01):
+    """
+    Compare the measurements against a baseline, on the cells both contain.
+
+    A cell regressed if it took more than (1 + tolerance) times the wall time of the baseline (and
+    more than floor seconds longer, as faster cells are dominated by noise), or no longer finishes
+    within the budget. It changed if both runs finished with different values.
+
+    :return: Dataset of the wall time and peak memory ratios and the regressed and changed flags
+    """
+    results, baseline = xr.align(results, baseline, join='inner')
+    finished = (results['status'] == OK) & (baseline['status'] == OK)
+
+    comparison = xr.Dataset({
+        'time_ratio': results['wall_time'] / baseline['wall_time'],
+        'memory_ratio': results['peak_memory'] / baseline['peak_memory'],
+        'regressed': (finished & (results['wall_time'] > (1 + tolerance) * baseline['wall_time'])
+                      & (results['wall_time'] - baseline['wall_time'] > floor))
+                     | ((baseline['status'] == OK) & (results['status'] != OK)),
+        'changed': finished & (results['value'] != baseline['value']),
+    })
+
+    for name, cells in (('Regressed', comparison['regressed']), ('Changed', comparison['changed'])):
+        for algorithm, n, m in cells.to_series().loc[lambda flags: flags].index:
+            logger.warning(f"{name}: {algorithm}, n={n}, m={m}")
+
+    return comparison
+
+
+def save(results, path):
+    """
+    Write the measurements as CSV, one row per cell.
+    """
+    results.to_dataframe().to_csv(path)
+
+
+def load(path):
+    """
+    Read measurements written by save.
+    """
+    return pd.read_csv(path, index_col=['algorithm', 'n', 'm']).to_xarray()
+
+
+if __name__ == "__main__":
+    log.configure()
+
+    parser = argparse.ArgumentParser(description="Scaling benchmark of all solvers")
+    parser.add_argument("--ns", type=int, nargs="+", default=NS)
+    parser.add_argument("--ms", type=int, nargs="+", default=MS)
+    parser.add_argument("--budget", type=float, default=BUDGET, help="Seconds per cell")
+    parser.add_argument("--algorithms", nargs="+", help="Names of the solvers of the suite to run")
+    parser.add_argument("--out", default="scaling.csv")
+    parser.add_argument("--baseline", default="scaling_baseline.csv")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as new baseline")
+    args = parser.parse_args()
+
+    algorithms = [algo for algo in suite() if args.algorithms is None or algo.name in args.algorithms]
+    results = scale(algorithms, args.ns, args.ms, args.budget)
+    save(results, args.out)
+
+    table = frontier(results).to_pandas()
+    print(tabulate(table, headers=table.columns.insert(0, "Largest n"), tablefmt="pipe"))
+
+    if args.save_baseline: save(results, args.baseline)
+    elif os.path.exists(args.baseline):
+        regressed = compare(results, load(args.baseline))['regressed']
+        print(f"{int(regressed.sum())} of {regressed.size} cells regressed against {args.baseline}")
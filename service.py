@@ -0,0 +1,206 @@
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+
+import numpy as np
+
+from algrotihms import LeastLoaded, Lookahead
+from generators import rng
+
+import log
+import logging
+
+logger = logging.getLogger("Service")
+
+MSG = ''' Dispatch Jobs Online '''
+
+
+def solver(name):
+    """
+    Online solver by name, "Least Loaded" or "Lookahead k" with k >= 1.
+    """
+    if not isinstance(name, str): raise ValueError(f"No online solver {name!r}")
+    if name == LeastLoaded.name: return LeastLoaded()
+
+    if name.startswith(Lookahead.name):
+        k = int(name.split()[-1])
+        if k < 1: raise ValueError(f"Lookahead needs k >= 1, not {k}")
+        return Lookahead(k)
+
+    raise ValueError(f"No online solver {name}")
+
+
+def machines(m):
+    """
+    Number of machines of a header, a positive integer.
+    """
+    if isinstance(m, bool) or not isinstance(m, int) or m < 1:
+        raise ValueError(f"m must be a positive integer, not {m!r}")
+    return m
+
+
+def percentiles(latencies):
+    if not latencies: return {'p50': None, 'p99': None}
+    p50, p99 = np.percentile(latencies, [50, 99])
+    return {'p50': float(p50), 'p99': float(p99)}
+
+
+class Service:
+    """
+    Dispatch streams of jobs with online solvers, one session per connection.
+
+    Protocol (lines): the client sends {"algorithm": ..., "m": ...} as JSON, then one weight per line,
+    and closes its side when done. The server answers "job machine" for every job as soon as it is
+    decided (Lookahead k decides a job once the k - 1 following ones arrived), then a JSON summary
+    with the target function and latencies. An invalid header or weight is answered with
+    {"error": ...} instead, which ends the session. Jobs are read only as fast as the answers are
+    written, so a client not reading gets slowed down (backpressure).
+
+    Latency of a job is the time from reading it to writing its machine, in seconds.
+
+    :param window: Number of most recent latencies kept for the percentiles
+    """
+
+    def __init__(self, window=1 << 16):
+        self.latencies = deque(maxlen=window)
+        self.sessions = 0
+
+    def stats(self):
+        """
+        :return: p50 and p99 latency of the most recent jobs of all sessions
+        """
+        return percentiles(self.latencies)
+
+    async def handle(self, reader, writer):
+        self.sessions += 1
+        session = self.sessions
+        latencies = []
+
+        try:
+            try:
+                header = json.loads(await reader.readline())
+                algo = solver(header['algorithm'])
+                algo.start(machines(header['m']))
+            except (ValueError, KeyError, TypeError) as e:
+                await reply(writer, {'error': str(e)})
+                return
+
+            logger.info(f"Session {session}: {algo.name} on {header['m']} machines")
+
+            arrivals, decided = deque(), 0
+
+            def emit(machines):
+                nonlocal decided
+                now = time.perf_counter()
+                for machine in machines:
+                    latencies.append(now - arrivals.popleft())
+                    writer.write(f"{decided} {machine}\n".encode())
+                    decided += 1
+
+            try:
+                async for line in reader:
+                    arrivals.append(time.perf_counter())
+                    emit(algo.push([int(line)]))
+                    await writer.drain()
+            except (ValueError, OverflowError) as e:
+                # e.g. a blank line or a weight that is no (non-negative) integer ends the session
+                logger.info(f"Session {session}: {e}")
+                await reply(writer, {'error': str(e), 'jobs': decided})
+                return
+
+            emit(algo.drain())
+
+            summary = {'jobs': decided, 'value': int(algo.finish()), **percentiles(latencies)}
+            logger.info(f"Session {session}: {summary}")
+            await reply(writer, summary)
+        except ConnectionError as e:
+            logger.info(f"Session {session}: {e}")
+        finally:
+            self.latencies.extend(latencies)
+            writer.close()
+
+
+async def reply(writer, message):
+    """
+    Write message as a JSON line.
+    """
+    writer.write((json.dumps(message) + "\n").encode())
+    await writer.drain()
+
+
+async def serve(host="127.0.0.1", port=8765, path=None):
+    """
+    Run the service on localhost TCP, or on a Unix socket if a path is given.
+    """
+    service = Service()
+    if path: server = await asyncio.start_unix_server(service.handle, path)
+    else: server = await asyncio.start_server(service.handle, host, port)
+
+    logger.info(f"{MSG:=^150}")
+    logger.info(f"Listening on {path or f'{host}:{port}'}")
+
+    async with server:
+        await server.serve_forever()
+
+
+async def load(algorithm, m, jobs, host="127.0.0.1", port=8765, path=None, rate=None):
+    """
+    Load generator: stream jobs to the service in one session, reading the answers concurrently.
+
+    :param algorithm: Name of the online solver
+    :param m: Number of Machines
+    :param jobs: Weights to send
+    :param rate: Jobs per second, as fast as possible if None
+    :return: Summary of the session, with the client side round trip percentiles added
+    """
+    if path: reader, writer = await asyncio.open_unix_connection(path)
+    else: reader, writer = await asyncio.open_connection(host, port)
+
+    sent = []
+
+    async def send():
+        writer.write((json.dumps({'algorithm': algorithm, 'm': m}) + "\n").encode())
+        for w in jobs:
+            sent.append(time.perf_counter())
+            writer.write(f"{int(w)}\n".encode())
+            await writer.drain()
+            if rate: await asyncio.sleep(1 / rate)
+        writer.write_eof()
+
+    async def receive():
+        round_trips = []
+        async for line in reader:
+            line = line.decode().strip()
+            if line.startswith("{"): return json.loads(line), round_trips
+
+            job, _ = line.split()
+            round_trips.append(time.perf_counter() - sent[int(job)])
+
+    _, (summary, round_trips) = await asyncio.gather(send(), receive())
+    writer.close()
+
+    return {**summary, 'round_trip': percentiles(round_trips)}
+
+
+if __name__ == "__main__":
+    log.configure()
+
+    parser = argparse.ArgumentParser(description="Online scheduling service")
+    parser.add_argument("mode", choices=["serve", "load"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--path", help="Unix socket instead of TCP")
+    parser.add_argument("--algorithm", default=LeastLoaded.name)
+    parser.add_argument("-m", type=int, default=4)
+    parser.add_argument("-n", type=int, default=10_000, help="Jobs sent by the load generator")
+    parser.add_argument("--rate", type=float, help="Jobs per second sent by the load generator")
+    args = parser.parse_args()
+
+    if args.mode == "serve":
+        asyncio.run(serve(args.host, args.port, args.path))
+    else:
+        weights = rng(0).integers(1, 101, size=args.n)
+        print(json.dumps(asyncio.run(load(args.algorithm, args.m, weights, args.host, args.port, args.path,
+                                          args.rate))))
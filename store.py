@@ -0,0 +1,237 @@
+import json
+import os
+from urllib.parse import quote
+
+import numpy as np
+import xarray as xr
+
+from algrotihms.base import dtype
+from generators import LEGACY, STREAM
+
+MANIFEST = "manifest.json"
+
+
+class ResultStore:
+    """
+    Chunked store of precomputed solutions. Every (stream, algorithm, n, m) block of generator x seed
+    values is a directory of .npy files with a JSON manifest, written as soon as it is computed. The
+    manifest is written last, so a block without one (e.g. after a crash) counts as missing. Blocks
+    of instances of different random streams (see generators.rng) are kept apart and never combined.
+
+    Writing more seeds of a block merges them into it. The merged block goes to files of a new
+    version, which the manifest switches to at once, so a crash meanwhile loses no committed seeds.
+
+    Blocks are memory-mapped when loaded, NetCDF and CSV exports are only written on request.
+
+    :param root: Directory of the store
+    """
+
+    def __init__(self, root="precomputed"):
+        self.root = root
+
+    def path(self, algorithm, n, m, stream=STREAM):
+        return os.path.join(self.root, quote(stream, safe=''), quote(algorithm, safe=''), f"n{n}", f"m{m}")
+
+    def manifest(self, algorithm, n, m, stream=STREAM):
+        """
+        :return: Manifest of the block, None if it has not been committed
+        """
+        try:
+            with open(os.path.join(self.path(algorithm, n, m, stream), MANIFEST)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def has(self, algorithm, n, m, seeds=None, profile=False, stream=STREAM):
+        """
+        Whether the block is committed, for instances of the stream, for at least the given seeds
+        and with a profile of them if asked.
+        """
+        manifest = self.manifest(algorithm, n, m, stream)
+        if manifest is None: return False
+
+        stored = _profiled(manifest) if profile else manifest['seeds']
+        return bool(stored) if seeds is None else set(seeds) <= set(stored)
+
+    def missing(self, algorithm, n, m, seeds, profile=False, stream=STREAM):
+        """
+        :return: The seeds of which the block is not committed (or has no profile, if asked)
+        """
+        manifest = self.manifest(algorithm, n, m, stream)
+        stored = set() if manifest is None else set(_profiled(manifest) if profile else manifest['seeds'])
+        return [seed for seed in seeds if seed not in stored]
+
+    def write(self, algorithm, n, m, solutions, profile=None, stream=STREAM):
+        """
+        Commit a block, merged with the seeds committed before (those given again are replaced).
+        Measurements of seeds that were not profiled are NaN.
+
+        :param algorithm: Name of the algorithm
+        :param n: Number of Jobs
+        :param m: Number of Machines
+        :param solutions: DataArray with generator and seed dimensions (and randomized coordinate)
+        :param profile: Dataset of measurements of the same shape, see computer.PROFILE
+        :param stream: Random stream the instances were generated with, see generators.rng
+        """
+        path = self.path(algorithm, n, m, stream)
+        os.makedirs(path, exist_ok=True)
+
+        solutions = solutions.transpose('generator', 'seed')
+        seeds = solutions['seed'].values.tolist()
+        arrays = {'values': solutions.values.astype(dtype)}
+        units = {}
+        if profile is not None:
+            for name, measured in profile.data_vars.items():
+                arrays[name] = measured.transpose('generator', 'seed').values
+                units[name] = measured.attrs.get('units')
+        profiled = seeds if units else []
+
+        previous = self.manifest(algorithm, n, m, stream)
+        kept = [] if previous is None else [seed for seed in previous['seeds'] if seed not in seeds]
+
+        if kept:
+            if previous['generators'] != solutions['generator'].values.tolist():
+                raise ValueError(f"Generators of {algorithm} for n={n}, m={m} differ from those stored")
+
+            index = [previous['seeds'].index(seed) for seed in kept]
+            units = {**previous['profile'], **units}
+
+            for name in ['values', *units]:
+                before = self.array(previous, name)[:, index] if name in ['values', *previous['profile']] else None
+                after = arrays.get(name)
+                if before is None: before = np.full((len(previous['generators']), len(kept)), np.nan)
+                if after is None: after = np.full((len(previous['generators']), len(seeds)), np.nan)
+                arrays[name] = np.concatenate([before, after], axis=1)
+
+            profiled = [seed for seed in _profiled(previous) if seed in kept] + profiled
+            seeds = kept + seeds
+
+        order = np.argsort(seeds, kind='stable')
+        version = 1 if previous is None else previous.get('version', 0) + 1
+
+        for name, array in arrays.items():
+            np.save(os.path.join(path, _file(name, version)), array[:, order])
+
+        manifest = {
+            'algorithm': algorithm,
+            'n': int(n),
+            'm': int(m),
+            'generators': solutions['generator'].values.tolist(),
+            'randomized': solutions['randomized'].values.tolist(),
+            'seeds': sorted(seeds),
+            'stream': stream,
+            'profile': units,
+            'profiled': sorted(profiled),
+            'version': version,
+        }
+
+        tmp = os.path.join(path, f"{MANIFEST}.{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, os.path.join(path, MANIFEST))
+
+        # files of the previous version (which readers may still have memory-mapped)
+        if previous is None: return
+        for name in ['values', *previous['profile']]:
+            try:
+                os.remove(os.path.join(path, _file(name, previous.get('version'))))
+            except FileNotFoundError:
+                pass
+
+    def manifests(self, algorithms=None, ns=None, ms=None, stream=STREAM):
+        """
+        Manifests of all committed blocks of a stream, optionally only of some algorithms, n or m.
+        """
+        root = os.path.join(self.root, quote(stream, safe=''))
+        if not os.path.isdir(root): return
+
+        for directory, _, files in os.walk(root):
+            if MANIFEST not in files: continue
+
+            with open(os.path.join(directory, MANIFEST)) as f:
+                manifest = json.load(f)
+
+            if algorithms is not None and manifest['algorithm'] not in algorithms: continue
+            if ns is not None and manifest['n'] not in ns: continue
+            if ms is not None and manifest['m'] not in ms: continue
+            yield manifest
+
+    def array(self, manifest, name="values"):
+        """
+        The generator x seed array of a block, memory-mapped.
+        """
+        path = self.path(manifest['algorithm'], manifest['n'], manifest['m'], manifest['stream'])
+        return np.load(os.path.join(path, _file(name, manifest.get('version'))), mmap_mode='r')
+
+    def block(self, manifest, name="values"):
+        """
+        A block as DataArray with algorithm, n, generator, m, seed dimensions, memory-mapped.
+        """
+        values = self.array(manifest, name)
+
+        return xr.DataArray(values[None, None, :, None, :],
+                            coords={'algorithm': [manifest['algorithm']],
+                                    'n': [manifest['n']],
+                                    'generator': manifest['generators'],
+                                    'm': [manifest['m']],
+                                    'seed': manifest['seeds'],
+                                    'randomized': ('generator', manifest['randomized'])},
+                            dims=['algorithm', 'n', 'generator', 'm', 'seed'],
+                            name=name)
+
+    def load(self, algorithms=None, ns=None, ms=None, stream=STREAM):
+        """
+        Stored solutions of a stream, as a DataArray with algorithm, n, generator, m, seed dimensions.
+        """
+        blocks = [self.block(manifest) for manifest in self.manifests(algorithms, ns, ms, stream)]
+        if not blocks: raise FileNotFoundError(f"No solutions of stream {stream} stored in {self.root}")
+
+        # blocks of fewer seeds are padded (with NaN) to the most seeds stored
+        return xr.combine_by_coords(blocks, join='outer')['values'].rename(None)
+
+    def load_profile(self, algorithms=None, ns=None, ms=None, stream=STREAM):
+        """
+        Stored measurements of a stream, as a Dataset with the dimensions of load.
+        """
+        blocks = [xr.Dataset({name: self.block(manifest, name).assign_attrs(units=unit)
+                              for name, unit in manifest['profile'].items()})
+                  for manifest in self.manifests(algorithms, ns, ms, stream) if manifest['profile']]
+        if not blocks: raise FileNotFoundError(f"No profiles of stream {stream} stored in {self.root}")
+
+        return xr.combine_by_coords(blocks, join='outer')
+
+    def ingest(self, solutions, n, stream=LEGACY):
+        """
+        Add solutions of the former single file layout (algorithm, generator, m, seed) for n.
+        """
+        for algorithm in solutions['algorithm'].values:
+            for m in solutions['m'].values:
+                self.write(str(algorithm), n, m, solutions.sel(algorithm=algorithm, m=m), stream=stream)
+
+    def export(self, file_name="precomputed", n=None, profile=False, stream=STREAM):
+        """
+        Write all stored solutions (or measurements) of a stream as NetCDF and CSV.
+
+        :param file_name: File name without extension
+        :param n: Only export this n, dropping the n dimension as in the former single file layout
+        :param profile: Export the measurements instead of the solutions
+        :param stream: Random stream of the instances
+        """
+        data = self.load_profile(stream=stream) if profile else self.load(stream=stream)
+        if n is not None: data = data.sel(n=n)
+
+        data.to_netcdf(file_name + ".nc")
+        df = data.to_dataframe() if profile else data.stack(combined=data.dims).to_pandas()
+        df.to_csv(file_name + ".csv")
+
+
+def _file(name, version):
+    # blocks written before versioning have unversioned files
+    return f"{name}.npy" if version is None else f"{name}.{version}.npy"
+
+
+def _profiled(manifest):
+    """
+    Seeds of a block with measurements, all of them in blocks written before these were tracked.
+    """
+    return manifest.get('profiled', manifest['seeds'] if manifest['profile'] else [])
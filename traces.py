@@ -0,0 +1,92 @@
+import os
+from urllib.parse import quote
+
+import numpy as np
+
+from algrotihms.base import dtype
+
+
+def open_trace(path, trace_dtype=dtype, column=0, header=None, chunk=1 << 20):
+    """
+    Memory-map the job weights of a trace, without loading it.
+
+    - .npy files are mapped as they are
+    - CSV and Parquet files (a column of them) are converted once, chunk by chunk, into a raw
+      file next to them (one per column), which is mapped and reused while it is newer than the trace
+    - anything else is read as raw binary of trace_dtype
+
+    :param path: Trace file
+    :param trace_dtype: dtype of raw binary traces, and of the conversion of CSV and Parquet traces
+    :param column: Name or position of the weight column of CSV and Parquet traces
+    :param header: Row of the column names of CSV traces. None (default) for CSV traces without one,
+                   e.g. a bare column of weights, whose columns are then given by position.
+    :param chunk: Rows converted at once
+    :return: Read-only 1D array of weights
+    """
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == ".npy": return np.load(path, mmap_mode='r')
+    if ext == ".csv" and header is None and not isinstance(column, int):
+        raise ValueError(f"Columns of CSV traces without header are positions, not {column!r}")
+    if ext in (".csv", ".parquet"): path = _convert(path, ext, trace_dtype, column, header, chunk)
+
+    if os.path.getsize(path) == 0: return np.empty(0, dtype=trace_dtype)
+    return np.memmap(path, dtype=trace_dtype, mode='r')
+
+
+def _convert(path, ext, trace_dtype, column, header, chunk):
+    # the column (and the header row, which shifts the rows) are part of the name of the raw file
+    source = quote(str(column), safe='') + ("" if ext != ".csv" or header is None else f".h{header}")
+    raw = f"{path}.{source}.{np.dtype(trace_dtype).name}.raw"
+    if os.path.exists(raw) and os.path.getmtime(raw) >= os.path.getmtime(path): return raw
+
+    blocks = _csv_blocks(path, column, header, chunk) if ext == ".csv" else _parquet_blocks(path, column, chunk)
+
+    tmp = f"{raw}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        for block in blocks: np.asarray(block, dtype=trace_dtype).tofile(f)
+    os.replace(tmp, raw)
+
+    return raw
+
+
+def _csv_blocks(path, column, header, chunk):
+    import pandas as pd
+
+    for frame in pd.read_csv(path, header=header, usecols=[column], chunksize=chunk):
+        yield frame.iloc[:, 0].to_numpy()
+
+
+def _parquet_blocks(path, column, chunk):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Reading Parquet traces requires pyarrow") from e
+
+    file = pq.ParquetFile(path)
+    name = file.schema_arrow.names[column] if isinstance(column, int) else column
+
+    for batch in file.iter_batches(batch_size=chunk, columns=[name]):
+        yield batch.column(0).to_numpy()
+
+
+def chunks(trace, size=1 << 20):
+    """
+    Consecutive chunks of a trace in the common dtype. Chunks are views if the trace already is of
+    it, else only one chunk at a time is converted.
+    """
+    for i in range(0, len(trace), size):
+        yield np.asarray(trace[i:i + size], dtype=dtype)
+
+
+def evaluate(algo, m, path, size=1 << 20, **kwargs):
+    """
+    Target function of an algorithm on a trace file, pushed chunk by chunk to online algorithms.
+
+    :param algo: Algorithm to run
+    :param m: Number of Machines
+    :param path: Trace file, see open_trace (which gets kwargs)
+    :param size: Jobs per chunk
+    :return: γ(algo, m, trace)
+    """
+    return algo.fit_transform_chunks(m, chunks(open_trace(path, **kwargs), size))
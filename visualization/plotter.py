@@ -207,6 +207,7 @@ def plot_scatter(
     size_palette: str = "viridis",
     output_dir: str = "plots",
     filename: str = None,
+    log_x: bool = False,
     **kwargs
 ):
     plt.figure(figsize=(10, 6))
@@ -221,6 +222,7 @@ def plot_scatter(
         alpha=0.7,
         **kwargs
     )
+    if log_x: plt.xscale("log")
     plt.title(title or f"{y_metric} vs {x_metric} Scatter Plot")
     plt.xlabel(xlabel or x_metric)
     plt.ylabel(ylabel or y_metric)
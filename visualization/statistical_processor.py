@@ -5,22 +5,54 @@ def relative_performance_ratio(solutions, optimal):
     return solutions / optimal
 
 
+def certified_gap(solutions, lower):
+    """
+    Relative excess over a lower bound on the optimum, which bounds the excess over the optimum
+    (relative_performance_ratio - 1) from above.
+    """
+    return solutions / lower - 1
+
+
 def standard_deviation(solutions):
     solutions = solutions.sel(generator=solutions.randomized)
     return solutions.std(dim="seed")
 
 
 def relative_improvement(solutions):
+    # differences are negative, which the unsigned dtype of the solvers cannot hold
+    solutions = solutions.astype(float)
     return -1 * solutions.diff(dim="m", label="lower") / solutions
 
 
-def compute_all_metrics(solutions, optimal):
-    rpr = relative_performance_ratio(solutions, optimal)
-    std = standard_deviation(rpr)
+def compute_all_metrics(solutions, optimal, profile=None, lower=None):
+    """
+    :param optimal: Optimal values, None at sizes out of reach of the exact DPs
+    :param lower: Lower bounds on the optimal values, see computer.compute_lower_bounds
+    """
+    metrics = {}
+
+    if optimal is not None:
+        rpr = relative_performance_ratio(solutions, optimal)
+        std = standard_deviation(rpr)
+
+        metrics["Relative_Performance_Ratio"] = rpr.mean(dim="seed")
+        metrics["Standard_Deviation"] = std.drop_vars("randomized")
+
     rel_imp = relative_improvement(solutions)
+    metrics["Relative_Improvement"] = rel_imp.mean(dim="seed")
+
+    if lower is not None:
+        gap = certified_gap(solutions, lower)
+
+        metrics["Certified_Gap"] = gap.mean(dim="seed")
+        metrics["Certified_Gap_Max"] = gap.max(dim="seed")
+
+    metrics = xr.Dataset(metrics)
+
+    if profile is None: return metrics
 
-    return xr.Dataset({
-        "Relative_Performance_Ratio": rpr.mean(dim="seed"),
-        "Standard_Deviation": std.drop_vars("randomized"),
-        "Relative_Improvement": rel_imp.mean(dim="seed"),
+    return metrics.assign({
+        "Wall_Time": profile.wall_time.mean(dim="seed"),
+        "CPU_Time": profile.cpu_time.mean(dim="seed"),
+        "Peak_Memory": profile.peak_memory.mean(dim="seed"),
     })
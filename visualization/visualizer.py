@@ -1,5 +1,4 @@
-import xarray as xr
-from plotter import plot_heatmap, plot_bar, plot_line
+from plotter import plot_heatmap, plot_bar, plot_line, plot_scatter
 
 interesting_algos = ['Least Loaded', 'Balanced Sequential Insert', 'Simple Sort & Split']
 
@@ -156,21 +155,65 @@ def plot_relative_improvement_line_A_vs_m(metrics_ds, **kwargs):
     )
 
 
+def plot_quality_vs_runtime_A_per_m(metrics_ds, **kwargs):
+    plot_scatter(
+        data=metrics_ds[["Relative_Performance_Ratio", "Wall_Time"]].mean("generator"),
+        x_metric="Wall_Time",
+        y_metric="Relative_Performance_Ratio",
+        hue="algorithm",
+        size="m",
+        title="Relative Performance Ratio vs measured Runtime",
+        xlabel="Wall Time per Instance [s]",
+        ylabel="Relative Performance Ratio",
+        filename="RPR-RT-SCATTER-A-m.png",
+        log_x=True,
+        **kwargs
+    )
+
+
 def plot_all_metrics(metrics_ds, **kwargs):
     plot_relative_performance_ratio_heatmap_G_vs_A_per_m(metrics_ds, **kwargs)
     plot_relative_performance_ratio_heatmap_G_vs_m_per_A_interesting(metrics_ds, **kwargs)
     plot_relative_performance_ratio_line_G_vs_A_per_m_interesting(metrics_ds, **kwargs)
     plot_standard_deviation_bar_G_vs_A(random_only(metrics_ds), **kwargs)
     plot_relative_improvement_line_A_vs_m(sel_algos(metrics_ds, interesting_algos), **kwargs)
+    if "Wall_Time" in metrics_ds: plot_quality_vs_runtime_A_per_m(metrics_ds, **kwargs)
 
 
 if __name__ == "__main__":
+    import os
+    import sys
+
+    import xarray as xr
+
+    # run as visualization/visualizer.py from the repository root, which holds the store
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from generators import LEGACY
     from statistical_processor import compute_all_metrics
+    from store import ResultStore
+
+    store = ResultStore('./precomputed')
 
-    solutions = xr.open_dataarray('./precomputed.nc')
+    # stream of the instances to plot the results of, e.g. generators.STREAM for those of precompute.
+    # Defaults to the legacy one of the results precomputed in the former single file.
+    stream = sys.argv[1] if len(sys.argv) > 1 else LEGACY
+
+    # the results of the former single file (for n=150) are ingested into the store once
+    ingested = next(store.manifests(ns=[150], stream=LEGACY), None) is not None
+    if stream == LEGACY and not ingested and os.path.exists('./precomputed.nc'):
+        with xr.open_dataarray('./precomputed.nc') as legacy:
+            store.ingest(legacy.load(), n=150)
+
+    solutions = store.load(ns=[150], stream=stream).sel(n=150)
     optimal_solution = solutions.sel(algorithm='DP')
 
-    metrics_ds = compute_all_metrics(solutions, optimal_solution).reindex(algorithm=algos_order,
+    try:
+        profile = store.load_profile(ns=[150], stream=stream).sel(n=150)
+    except FileNotFoundError:
+        profile = None
+
+    metrics_ds = compute_all_metrics(solutions, optimal_solution, profile).reindex(algorithm=algos_order,
                                                                           generator=gens_order)
 
     plot_all_metrics(metrics_ds)